@@ -1,24 +1,48 @@
-import pickle
 import cv2
 import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
 import numpy as np
-import tensorflow as tf
-import winspeech
-from collections import deque
-import threading
+from fast_inference import load_classifier
+from hand_features import stack_points, points_to_features, points_to_boxes
+from hand_classifier import decode_probs, make_predictions
+import os
 import time
-import serial
-import json
-import queue
-import sounddevice as sd
-from vosk import Model, KaldiRecognizer
-import sys
+
+from frame_pipeline import FramePipeline
+from perf import PerfStats
+from tts_worker import SpeechWorker, create_engine
+from voice_servo import VoiceServoJob, LISTENING
+from servo_protocol import ServoSequencer
+from serial_transport import SerialTransport, serial
+from voice_stream import StreamingListener, MicrophoneSource, WavSource
+from voice_grammar import VOICE_WORDS_PATH, load_words, build_grammar, text_to_word
+from startup import Startup
+from roi_tracker import RoiTracker
+from quality_controller import QualityController
+from letter_debounce import LetterConfirmer, PredictionRecorder, POLICIES, CONFIRMED
+from temporal_filter import HandTracks, PredictionCache
+from sequence_model import SEQUENCE_MODEL_PATH, SequenceClassifier
+
+# Hardware / OS specific modules are optional so the recognizer can also be
+# driven headless (see benchmark.py) on machines without them.
+try:
+    import sounddevice as sd
+except ImportError:
+    sd = None
+try:
+    from vosk import Model, KaldiRecognizer
+except ImportError:
+    Model = KaldiRecognizer = None
 
 # ================== GLOBAL CONFIG ==================
 
 # Vosk model
 VOSK_MODEL_PATH = r"E:\Gesture_ANN\vosk-model-small-en-us-0.15"
 
+# Camera capture size
+CAMERA_WIDTH = 1280
+CAMERA_HEIGHT = 720
+
 # Serial ESP32
 SERIAL_PORT = "COM7"
 BAUD_RATE = 115200
@@ -27,12 +51,81 @@ BAUD_RATE = 115200
 SAMPLE_RATE = 16000
 BLOCK_DURATION_MS = 30  # ms
 
-# Delay between letters when running voice→servo sequence
-LETTER_INTERVAL_SEC = 8.0  # <<< changed to 8 seconds
+# Streaming voice input (voice_stream.py): audio kept from just before BTN2,
+# and how long the partial text must stay unchanged to end the word
+VOICE_PREROLL_MS = 500
+VOICE_ENDPOINT_MS = 700
+
+# Feed this 16 kHz mono WAV file instead of the microphone (testing, None = mic)
+VOICE_WAV_PATH = None
+
+# Restrict Vosk to the allowed words + spoken letter names (voice_grammar.py).
+# The word list is read from VOICE_WORDS_PATH if that file exists.
+VOICE_GRAMMAR = True
+
+# Max wait per letter when running voice→servo sequence. The next letter is
+# sent as soon as the ESP32 reports "Sequence X done."; this is only the
+# fallback for letters without a learned duration (see servo_protocol.py)
+LETTER_INTERVAL_SEC = 8.0
+
+# Extra pause after each acknowledged letter so the gesture can be seen
+LETTER_HOLD_SEC = 0.5
 
 # Max letters allowed from voice
 MAX_VOICE_LETTERS = 6
 
+# Load the Vosk model on the first BTN2 press instead of in the background at startup
+LAZY_VOSK = True
+
+# Text-to-speech engine: 'auto' (winspeech, else pyttsx3), 'winspeech', 'pyttsx3', 'null'
+TTS_ENGINE = "auto"
+
+# Hand classifier backend: 'numpy' (folded MLP, fastest), 'keras', 'tflite', 'onnx'.
+# 'numpy' loads hand_model.npz (export_model.py) when present, without TensorFlow.
+INFERENCE_BACKEND = "numpy"
+
+# Lower MediaPipe input size / skip frames / lower model_complexity when the
+# loop cannot keep TARGET_FPS, and restore quality when it can (quality_controller.py)
+ADAPTIVE_QUALITY = True
+TARGET_FPS = 20
+
+# Letter confirmation policy (letter_debounce.py): 'time' (~0.6 s of confidence-
+# weighted evidence, any FPS) or 'frames' (the original 20 consecutive frames)
+DEBOUNCE_POLICY = "time"
+
+# Smooth the 21 landmarks per tracked hand with a One-Euro filter before
+# classifying, and reuse the last probabilities while the smoothed features move
+# less than PREDICTION_CACHE_EPSILON (temporal_filter.py; 0 = always classify)
+SMOOTH_LANDMARKS = True
+ONE_EURO_MIN_CUTOFF = 1.0
+ONE_EURO_BETA = 10.0
+PREDICTION_CACHE_EPSILON = 0.004
+
+# Temporal model for moving signs (sequence_model.py), used when the file exists.
+# Needs SMOOTH_LANDMARKS (one stream per tracked hand); its label replaces the
+# per-frame one when it is more confident and above SEQUENCE_MIN_CONFIDENCE.
+# The window is a frame count: it spans WINDOW / fps seconds, so it covers more
+# time while the quality controller skips frames (these are not pushed)
+SEQUENCE_MIN_CONFIDENCE = 0.8
+
+# Append every frame's best prediction to this JSONL file for offline replay (None = off)
+PREDICTION_LOG_PATH = None
+
+# Track hands in a small crop around the last landmarks instead of searching the
+# full frame every time (roi_tracker.py; compare with benchmark.py --compare-roi)
+ROI_TRACKING = False
+ROI_INPUT_SIZE = 256
+
+# Run capture / inference / render on separate threads (False = old serial loop)
+PIPELINED_MODE = True
+
+# Performance overlay (toggle with 'P') and stats file written at exit (.json or .csv, None = off)
+SHOW_PERF_OVERLAY = False
+PERF_DUMP_PATH = None
+
+# Stages shown on the performance overlay, in order
+OVERLAY_STAGES = ('capture', 'preprocess', 'roi_crop', 'mediapipe', 'classifier', 'sequence', 'drawing', 'display', 'serial')
+
 # ===================================================
 
 
@@ -44,22 +137,31 @@ class HandSignRecognizer:
         self.hands = None
         self.detected_words = []
 
-        # Detection stability
-        self.required_continuous_frames = 20
-        self.confidence_threshold = 0.7
-        self.frame_history = deque(maxlen=self.required_continuous_frames)
-        self.last_spoken_char = None
-        self.cooldown_frames = 20
-        self.cooldown_counter = 0
+        # Detection stability (letter_debounce.py)
+        self.confirmer = LetterConfirmer(POLICIES[DEBOUNCE_POLICY])
+        self.confidence_threshold = self.confirmer.policy.enter_threshold
+        self.prediction_log = PredictionRecorder(PREDICTION_LOG_PATH) if PREDICTION_LOG_PATH else None
+
+        # Landmark smoothing / prediction reuse between frames (temporal_filter.py)
+        self.hand_tracks = HandTracks(ONE_EURO_MIN_CUTOFF, ONE_EURO_BETA) if SMOOTH_LANDMARKS else None
+        self.prediction_cache = PredictionCache(PREDICTION_CACHE_EPSILON) if PREDICTION_CACHE_EPSILON else None
+
+        # Optional sequence model for moving signs, one SequenceStream per track id
+        self.sequence_model = None
+        self._sequence_streams = {}
 
-        # TTS
-        self.tts_lock = threading.Lock()
-        self.is_speaking = False
+        # Time source for filters and letter confirmation (benchmark.py replays with the video clock)
+        self.clock = time.perf_counter
+
+        # TTS (background worker, see tts_worker.py)
+        self.tts = None
 
         # Vosk / Serial
         self.vosk_model = None
         self.vosk_recognizer = None
-        self.ser = None
+        self.voice_listener = None
+        self.voice_words = load_words(VOICE_WORDS_PATH, MAX_VOICE_LETTERS)
+        self.serial_link = None
 
         # Window name (for full screen)
         self.window_name = "✨ AI Hand Sign Recognition with TTS"
@@ -67,31 +169,62 @@ class HandSignRecognizer:
         # Main-loop running flag (for button1 = quit)
         self.running = True
 
-        self.setup_tts()
-        self.load_model()
-        self.setup_camera()
-        self.setup_vosk()
-        self.setup_serial()
+        # Capture/inference threads when running in PIPELINED_MODE
+        self.pipeline = None
+
+        # Background voice -> servo sequence (BTN2), see voice_servo.py
+        self.voice_job = None
+        self.servo = ServoSequencer(self.send_servo_command, default_timeout=LETTER_INTERVAL_SEC)
+        self._frame_shape = (CAMERA_HEIGHT, CAMERA_WIDTH, 3)
+
+        # Reused square RGB input for MediaPipe (see prepare_mediapipe_input)
+        self._rgb_square = None
+        self.roi_tracker = None
+
+        # Adaptive quality: last landmarks and predictions reused on skipped frames, Hands per model_complexity
+        self.quality = QualityController(TARGET_FPS) if ADAPTIVE_QUALITY else None
+        self._last_landmarks = None
+        self._last_hands = []
+        self._analyze_start = None
+        self._hands_by_complexity = {}
+
+        # Per-stage latency samples (perf.py)
+        self.perf = PerfStats()
+        self.show_perf = SHOW_PERF_OVERLAY
+        self._perf_text = ""
+        self._perf_text_time = 0.0
+
+        # The camera opens first; everything else loads on background threads
+        # (startup.py) and reports when it is ready
+        self.startup = Startup()
+        self.startup.register('model', self.load_model)
+        self.startup.register('tts', self.setup_tts)
+        self.startup.register('serial', self.setup_serial)
+        self.startup.register('vosk', self.setup_vosk, lazy=LAZY_VOSK)
+        self.startup.start()
+        self.startup.run_now('camera', self.setup_camera)
 
     # ============== TTS ==================
     def setup_tts(self):
-        try:
-            winspeech.say("Test")
-        except Exception:
-            pass
+        # Engine warmup happens on the worker thread, so this returns immediately
+        self.tts = SpeechWorker(create_engine(TTS_ENGINE), perf=self.perf).start()
 
-    def speak_text(self, text):
-        try:
-            winspeech.say(text)
-        except Exception as e:
-            print("TTS error:", e)
+    def speak_text(self, text, replace=False):
+        """Queue text for speech; never blocks the frame loop."""
+        if self.tts is not None:
+            self.tts.say(text, replace=replace)
 
     # ============== Hand model ============
     def load_model(self):
-        self.model = tf.keras.models.load_model('improved_hand_model.h5')
-        label_dict = pickle.load(open('label_encoder.pickle', 'rb'))
-        self.label_encoder = label_dict['label_encoder']
-        print("✅ Hand model loaded")
+        # Runs on a startup thread; frames are only classified once self.model is set
+        model, self.label_encoder = load_classifier('improved_hand_model.h5', 'label_encoder.pickle',
+                                                    backend=INFERENCE_BACKEND)
+        if os.path.exists(SEQUENCE_MODEL_PATH):
+            self.sequence_model = SequenceClassifier.from_npz(SEQUENCE_MODEL_PATH)
+            print(f"✅ Sequence model loaded ({self.sequence_model.window} frames, "
+                  f"classes {list(self.sequence_model.classes_)})")
+        self.model = model
+        print(f"✅ Hand model loaded ({self.model.name} backend)")
         print("📊 Classes:", list(self.label_encoder.classes_))
 
     # ============== Camera / Mediapipe ============
@@ -107,180 +240,346 @@ class HandSignRecognizer:
             self.cap = None
             return
 
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
 
+        self.setup_hands()
+
+    def setup_hands(self):
         self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
 
-        self.hands = self.mp_hands.Hands(
+        self.hands = self.hands_for_complexity(1)
+
+        if ROI_TRACKING:
+            self.enable_roi_tracking()
+
+    def create_hands(self, model_complexity=1):
+        return self.mp_hands.Hands(
             static_image_mode=False,
             max_num_hands=2,
+            model_complexity=model_complexity,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.5
         )
 
+    def hands_for_complexity(self, model_complexity):
+        """Hands instance for a model_complexity, created once and kept for later switches."""
+        hands = self._hands_by_complexity.get(model_complexity)
+        if hands is None:
+            hands = self._hands_by_complexity[model_complexity] = self.create_hands(model_complexity)
+        return hands
+
+    def enable_roi_tracking(self, size=ROI_INPUT_SIZE):
+        # Own Hands instance: its internal tracking state belongs to the crop coordinates
+        self.roi_tracker = RoiTracker(self.create_hands(), size=size, perf=self.perf)
+
     # ============== Vosk ==================
     def setup_vosk(self):
         print("Loading Vosk model... (this may take a few seconds)")
         try:
             self.vosk_model = Model(VOSK_MODEL_PATH)
-            self.vosk_recognizer = KaldiRecognizer(self.vosk_model, SAMPLE_RATE)
-            print("✅ Vosk model loaded")
+            if VOICE_GRAMMAR:
+                grammar = build_grammar(self.voice_words)
+                self.vosk_recognizer = KaldiRecognizer(self.vosk_model, SAMPLE_RATE, grammar)
+            else:
+                self.vosk_recognizer = KaldiRecognizer(self.vosk_model, SAMPLE_RATE)
+            print("✅ Vosk model loaded" + (f" ({len(self.voice_words)} words + letter names)" if VOICE_GRAMMAR else ""))
         except Exception as e:
             print("⚠️ Failed to load Vosk model:", e)
             self.vosk_model = None
             self.vosk_recognizer = None
+            raise
+        self.setup_voice_listener()
+
+    def setup_voice_listener(self):
+        """Open the audio input once; it stays open so BTN2 starts decoding immediately."""
+        if VOICE_WAV_PATH:
+            source = WavSource(VOICE_WAV_PATH, block_ms=BLOCK_DURATION_MS)
+        elif sd is not None:
+            source = MicrophoneSource(SAMPLE_RATE, int(SAMPLE_RATE * BLOCK_DURATION_MS / 1000))
+        else:
+            print("⚠️ sounddevice is not installed, voice input is disabled.")
+            return
+        try:
+            self.voice_listener = StreamingListener(self.vosk_recognizer, source,
+                                                    block_ms=BLOCK_DURATION_MS,
+                                                    preroll_ms=VOICE_PREROLL_MS,
+                                                    endpoint_ms=VOICE_ENDPOINT_MS).start()
+            print("✅ Audio input open")
+        except Exception as e:
+            print("⚠️ Could not open audio input:", e)
+            self.voice_listener = None
 
     # ============== Serial ==================
     def setup_serial(self):
+        if serial is None:
+            print("⚠️ pyserial is not installed, running without ESP32.")
+            return
         print(f"Opening serial port {SERIAL_PORT} at {BAUD_RATE} baud...")
-        try:
-            # small timeout so readline() won't block the GUI
-            self.ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=0.01)
-            time.sleep(2)
-            print("✅ Serial connected.")
-        except serial.SerialException as e:
-            print(f"⚠️ Could not open serial port: {e}")
-            self.ser = None
+        # The port is opened (and re-opened after a drop) on the transport's
+        # reader thread; servo acknowledgements go straight to the sequencer.
+        self.serial_link = SerialTransport(SERIAL_PORT, BAUD_RATE, on_line=self.servo.feed_line).start()
 
     def send_servo_command(self, cmd):
-        """Send a single command (letter A–Z or 'REL') to the ESP32."""
-        if self.ser is None:
+        """Send a single command (letter A–Z or 'REL') to the ESP32. Returns True if it was written."""
+        if self.serial_link is None or not self.serial_link.write(cmd):
             print("⚠️ No serial connection, cannot send servo command.")
-            return
-        try:
-            send_str = cmd + "\n"
-            self.ser.write(send_str.encode('utf-8'))
-            print(f"--> SENT TO ESP32: {cmd}")
-        except serial.SerialException as e:
-            print("Serial write error:", e)
-
-    # ============== Continuous detection ============
-    def check_continuous_detection(self, char, confidence):
-        if confidence >= self.confidence_threshold:
-            self.frame_history.append(char)
+            return False
+        print(f"--> SENT TO ESP32: {cmd}")
+        return True
+
+    # ============== Hand classification =============
+    def classify_hands(self, multi_hand_landmarks, side, now=None):
+        """
+        Classify every detected hand with a single model call.
+        Returns a list of HandPrediction (label, confidence, bbox, landmarks),
+        one per hand, in MediaPipe order. Landmarks are smoothed per tracked
+        hand first, and hands whose features barely moved reuse their last
+        probabilities instead of calling the model.
+        """
+        start = time.perf_counter()
+        points = raw_points = stack_points(multi_hand_landmarks)
+        track_ids = None
+        if self.hand_tracks is not None:
+            points, track_ids = self.hand_tracks.update(points, self.clock() if now is None else now)
+        features = points_to_features(points)
+        boxes = points_to_boxes(points, side).tolist()
+        self.perf.add('features', time.perf_counter() - start)
+
+        if self.prediction_cache is not None and track_ids is not None:
+            probs = self.perf.timed('classifier', self.prediction_cache.predict,
+                                    features, track_ids, self.model.predict)
         else:
-            self.frame_history.append(None)
+            probs = self.perf.timed('classifier', self.model.predict, features)
+        labels, confidences = decode_probs(probs, self.label_encoder)
+        if self.sequence_model is not None and track_ids is not None:
+            # Raw landmarks: the training clips are not One-Euro smoothed either
+            labels, confidences = self.apply_sequence_model(raw_points, track_ids, labels, confidences)
 
-        if len(self.frame_history) < self.required_continuous_frames:
-            return False
+        return make_predictions(labels, confidences, boxes, multi_hand_landmarks)
 
-        return all(x == char and x is not None for x in self.frame_history)
+    def apply_sequence_model(self, points, track_ids, labels, confidences):
+        """
+        Push each tracked hand's points into its SequenceStream (one
+        incremental step per frame). Where the sequence model is more
+        confident than the per-frame classifier, its label is used.
+        """
+        start = time.perf_counter()
+        labels, confidences = list(labels), list(confidences)
+        streams = {}
+        for i, track_id in enumerate(track_ids):
+            stream = self._sequence_streams.get(track_id) or self.sequence_model.stream()
+            streams[track_id] = stream
+            probs = stream.push_points(points[i])
+            if probs is None:
+                continue
+            best = int(probs.argmax())
+            if probs[best] >= SEQUENCE_MIN_CONFIDENCE and probs[best] > confidences[i]:
+                labels[i], confidences[i] = self.sequence_model.classes_[best], probs[best]
+        # Hands missing from this frame lose their window, as in the training clips
+        self._sequence_streams = streams
+        self.perf.add('sequence', time.perf_counter() - start)
+        return labels, confidences
 
     # ============== Frame processing =================
-    def process_frame(self, frame):
+    def prepare_mediapipe_input(self, frame, scale=1.0):
+        """
+        Square, zero-padded RGB copy of frame for MediaPipe, written into a
+        buffer that is allocated once and reused every frame. The padding
+        stays black because only the [:H, :W] region is ever written.
+        scale < 1 downsizes the frame first; landmarks are normalized, so
+        they still map onto the full-size frame.
+        """
+        if scale != 1.0:
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
         H, W = frame.shape[:2]
-
-        if self.cooldown_counter > 0:
-            self.cooldown_counter -= 1
-            if self.cooldown_counter == 0:
-                self.last_spoken_char = None
-
         side = max(H, W)
-        frame_square = np.zeros((side, side, 3), dtype=np.uint8)
-        frame_square[:H, :W] = frame
-        frame_rgb = cv2.cvtColor(frame_square, cv2.COLOR_BGR2RGB)
+        if self._rgb_square is None or self._rgb_square.shape[0] != side:
+            self._rgb_square = np.zeros((side, side, 3), dtype=np.uint8)
 
-        results = self.hands.process(frame_rgb)
+        region = self._rgb_square[:H, :W]
+        if region.flags.c_contiguous:
+            # Landscape frames: the top H rows are one contiguous block
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=region)
+        else:
+            np.copyto(region, frame[:, :, ::-1])
+        return self._rgb_square
+
+    def detect_full_frame(self, frame):
+        """MediaPipe on the whole (padded) frame; returns multi_hand_landmarks or None."""
+        scale = self.quality.level.scale if self.quality is not None else 1.0
+        frame_rgb = self.perf.timed('preprocess', self.prepare_mediapipe_input, frame, scale)
+        results = self.perf.timed('mediapipe', self.hands.process, frame_rgb)
+        return results.multi_hand_landmarks if results else None
+
+    def update_quality(self, start):
+        """Feed this frame's analysis time to the quality controller and apply its decision."""
+        interval = start - self._analyze_start if self._analyze_start is not None else 0.0
+        self._analyze_start = start
+        if self.quality.update(time.perf_counter() - start, interval):
+            # Runs on the inference thread, the only user of self.hands
+            self.hands = self.hands_for_complexity(self.quality.level.model_complexity)
+
+    def analyze_frame(self, frame):
+        """
+        Inference stage: MediaPipe, classifier and letter debounce.
+        Returns an analysis dict consumed by render_frame(); does not draw.
+        """
+        analyze_start = time.perf_counter()
+        now = self.clock()
+        H, W = frame.shape[:2]
+        side = max(H, W)
+        reused = self.quality is not None and not self.quality.should_process()
+        if reused:
+            # Skipped frame at this quality level: reuse the last landmarks
+            multi_hand_landmarks = self._last_landmarks
+        elif self.roi_tracker is not None:
+            multi_hand_landmarks = self.roi_tracker.process(frame, side, self.detect_full_frame)
+        else:
+            multi_hand_landmarks = self.detect_full_frame(frame)
+        self._last_landmarks = multi_hand_landmarks
 
-        current_prediction = None
-        current_confidence = 0
+        hands = []
         detection_status = "Show Your Hand"
 
-        if results and results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-
-                self.mp_drawing.draw_landmarks(
-                    frame_square,
-                    hand_landmarks,
-                    self.mp_hands.HAND_CONNECTIONS,
-                    self.mp_drawing_styles.get_default_hand_landmarks_style(),
-                    self.mp_drawing_styles.get_default_hand_connections_style()
-                )
-
-                x_ = [lm.x for lm in hand_landmarks.landmark]
-                y_ = [lm.y for lm in hand_landmarks.landmark]
-
-                data_aux = []
-                for lm in hand_landmarks.landmark:
-                    data_aux.append(lm.x - min(x_))
-                    data_aux.append(lm.y - min(y_))
-
-                if len(data_aux) == 42:
-                    prediction = self.model.predict(np.array([data_aux]), verbose=0)
-                    predicted_class = np.argmax(prediction)
-                    confidence = np.max(prediction)
-
-                    x1 = int(min(x_) * side) - 20
-                    y1 = int(min(y_) * side) - 20
-                    x2 = int(max(x_) * side) + 20
-                    y2 = int(max(y_) * side) + 20
-
-                    if confidence > 0.5:
-                        predicted_label = self.label_encoder.inverse_transform([predicted_class])[0]
-                        current_prediction = predicted_label
-                        current_confidence = confidence
-
-                        box_color = (0, 255, 0) if confidence > self.confidence_threshold else (0, 165, 255)
-                        self.draw_rounded_rect(frame_square, (x1, y1), (x2, y2), box_color, 2, radius=15)
-
-                        label_text = f'{predicted_label} ({confidence:.2f})'
-                        self.draw_gradient_background(frame_square, label_text, (x1, y1),
-                                                      bg_color=(0, 0, 0), text_color=box_color)
-
-                        self.draw_confidence_bar(frame_square, confidence, (x1, y2 + 10))
-
-                        if confidence >= self.confidence_threshold and self.cooldown_counter == 0:
-                            is_continuous = self.check_continuous_detection(current_prediction, current_confidence)
-
-                            if is_continuous:
-                                # '0' = backspace
-                                if current_prediction == '0':
-                                    self.handle_backspace()
-                                    detection_status = "Backspace"
-                                else:
-                                    self.speak_text(current_prediction)
-                                    self.detected_words.append(current_prediction)
-                                    detection_status = f"Detected: {current_prediction}!"
-
-                                self.last_spoken_char = current_prediction
-                                self.cooldown_counter = self.cooldown_frames
-                                self.frame_history.clear()
-
-                                print(f"📝 Current words: {''.join(self.detected_words)}")
-
-                            else:
-                                progress = len(
-                                    [x for x in self.frame_history if x == current_prediction and x is not None]
-                                )
-                                detection_status = f"Detecting: {current_prediction} ({progress}/{self.required_continuous_frames})"
-                        elif self.cooldown_counter > 0:
-                            detection_status = f"Cooldown: {self.cooldown_counter} frames"
-                        else:
-                            detection_status = f"Low Confidence: {current_prediction}"
+        if multi_hand_landmarks and self.model is None:
+            detection_status = "Loading model..."
+        elif reused:
+            # Same hands as last frame: no smoothing step or duplicate sequence frame
+            hands = self._last_hands
+        elif multi_hand_landmarks:
+            hands = self.classify_hands(multi_hand_landmarks, side, now)
+        elif self._sequence_streams:
+            # No hand: a moving sign has to start over
+            self._sequence_streams = {}
+        self._last_hands = hands
+
+        # One observation per frame (also without a hand, so cooldowns and
+        # time windows keep running): the most confident hand above 50%
+        debounce_start = time.perf_counter()
+        best = max((hand for hand in hands if hand.confidence > 0.5),
+                   key=lambda hand: hand.confidence, default=None)
+        label, confidence = (best.label, best.confidence) if best is not None else (None, 0.0)
+        decision = self.confirmer.update(label, confidence, now)
+        if self.prediction_log is not None:
+            self.prediction_log.write(now, None if label is None else str(label), confidence)
+
+        if decision.state == CONFIRMED:
+            # '0' = backspace
+            if decision.label == '0':
+                self.handle_backspace()
+                detection_status = "Backspace"
+            else:
+                self.speak_text(decision.label)
+                self.detected_words.append(decision.label)
+                detection_status = decision.text
+
+            print(f"📝 Current words: {''.join(self.detected_words)}")
+        elif best is not None:
+            detection_status = decision.text
+        self.perf.add('debounce', time.perf_counter() - debounce_start)
+
+        if self.quality is not None:
+            self.update_quality(analyze_start)
+
+        return {
+            'side': side,
+            'hands': hands,
+            'status': detection_status,
+        }
+
+    def render_frame(self, frame, analysis):
+        """
+        Render stage: draw landmarks, boxes and UI text directly onto frame.
+        Pixel coordinates in the padded square and in frame coincide (the
+        padding is only to the right/bottom), so boxes need no remapping.
+        """
+        H, W = frame.shape[:2]
+        draw_start = time.perf_counter()
+
+        for hand in analysis['hands']:
+            self.draw_hand_landmarks(frame, hand.landmarks, analysis['side'])
+
+            confidence = hand.confidence
+            x1, y1, x2, y2 = hand.bbox
+
+            if confidence > 0.5:
+                box_color = (0, 255, 0) if confidence > self.confidence_threshold else (0, 165, 255)
+                self.draw_rounded_rect(frame, (x1, y1), (x2, y2), box_color, 2, radius=15)
+
+                label_text = f'{hand.label} ({confidence:.2f})'
+                self.draw_gradient_background(frame, label_text, (x1, y1),
+                                              bg_color=(0, 0, 0), text_color=box_color)
+
+                self.draw_confidence_bar(frame, confidence, (x1, y2 + 10))
+
+        detection_status = analysis['status']
 
         # ---- UI text ----
-        cv2.putText(frame_square, f"Words: {''.join(self.detected_words)}",
+        cv2.putText(frame, f"Words: {''.join(self.detected_words)}",
                     (20, H - 100), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
 
         status_color = (0, 255, 0) if "Detected:" in detection_status else (255, 255, 255)
-        cv2.putText(frame_square, detection_status,
+        cv2.putText(frame, detection_status,
                     (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, status_color, 2)
 
-        settings_text = f"Settings: {self.required_continuous_frames} frames, {self.confidence_threshold*100:.0f}% confidence"
-        cv2.putText(frame_square, settings_text,
+        settings_text = f"Settings: {self.confirmer.describe()}"
+        cv2.putText(frame, settings_text,
                     (20, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
 
+        if self.show_perf:
+            (settings_w, _), _ = cv2.getTextSize(settings_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+            cv2.putText(frame, self.perf_overlay_text(),
+                        (40 + settings_w, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+
+        if self.quality is not None and (self.quality.index > 0 or self.show_perf):
+            cv2.putText(frame, self.quality.status_text(),
+                        (20, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 200, 255), 1)
+
+        if self.startup.loading:
+            cv2.putText(frame, "Starting: " + self.startup.status_text(),
+                        (20, 95), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+
         # Updated instructions: BTN1 = Quit instead of REL
         instructions = "ESP Buttons: 32=Quit | 33=Voice+Servo | 25=Clear | 26=Speak | 'Q'=Quit"
-        cv2.putText(frame_square, instructions,
+        cv2.putText(frame, instructions,
                     (20, H - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
 
-        return frame_square[:H, :W]
+        self.perf.add('drawing', time.perf_counter() - draw_start)
+        return frame
+
+    def process_frame(self, frame):
+        return self.render_frame(frame, self.analyze_frame(frame))
+
+    def perf_overlay_text(self):
+        """FPS and per-stage ms for the overlay, recomputed at most twice a second."""
+        now = time.perf_counter()
+        if now - self._perf_text_time > 0.5:
+            self._perf_text = self.perf.overlay_text(OVERLAY_STAGES)
+            if self.roi_tracker is not None:
+                self._perf_text += " | " + self.roi_tracker.status_text()
+            self._perf_text_time = now
+        return self._perf_text
 
     # ============== Drawing helpers =================
+    def draw_hand_landmarks(self, frame, hand_landmarks, side):
+        """Draw landmarks normalized to the padded side x side square onto the unpadded frame."""
+        H, W = frame.shape[:2]
+        sx, sy = side / W, side / H
+        scaled = landmark_pb2.NormalizedLandmarkList()
+        for lm in hand_landmarks.landmark:
+            scaled.landmark.add(x=lm.x * sx, y=lm.y * sy, z=lm.z)
+
+        self.mp_drawing.draw_landmarks(
+            frame,
+            scaled,
+            self.mp_hands.HAND_CONNECTIONS,
+            self.mp_drawing_styles.get_default_hand_landmarks_style(),
+            self.mp_drawing_styles.get_default_hand_connections_style()
+        )
+
     def draw_rounded_rect(self, img, pt1, pt2, color, thickness, radius=20):
         x1, y1 = pt1
         x2, y2 = pt2
@@ -307,67 +606,43 @@ class HandSignRecognizer:
             print("⌫ Backspace but nothing to delete")
 
     # ============== Voice (Vosk) =================
-    def listen_for_voice_word(self, timeout=4.0):
+    def listen_for_voice_word(self, timeout=4.0, cancel=None):
         """
         Listen with Vosk and return letters-only word (A–Z),
-        truncated to MAX_VOICE_LETTERS letters.
+        truncated to MAX_VOICE_LETTERS letters. Spelled letter names
+        ("bee", "double you") become their letter.
+        Returns None early if the cancel event gets set.
         """
-        if self.vosk_recognizer is None:
+        # First use loads Vosk (LAZY_VOSK); only this job's thread waits for it
+        if not self.startup.ensure('vosk', cancel=cancel):
+            if cancel is None or not cancel.is_set():
+                print("⚠️ Vosk is not initialized.")
+            return None
+        if self.voice_listener is None:
             print("⚠️ Vosk is not initialized.")
             return None
 
         print("🎤 Listening for voice word...")
-        self.vosk_recognizer.Reset()
-
-        q_audio = queue.Queue()
-
-        def audio_callback(indata, frames, time_info, status):
-            if status:
-                print(status, file=sys.stderr)
-            q_audio.put(bytes(indata))
-
-        block_size = int(SAMPLE_RATE * BLOCK_DURATION_MS / 1000)
-        text_result = ""
-
-        with sd.RawInputStream(samplerate=SAMPLE_RATE,
-                               blocksize=block_size,
-                               dtype='int16',
-                               channels=1,
-                               callback=audio_callback):
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                remaining = timeout - (time.time() - start_time)
-                if remaining <= 0:
-                    break
-                try:
-                    data = q_audio.get(timeout=remaining)
-                except queue.Empty:
-                    break
-
-                if self.vosk_recognizer.AcceptWaveform(data):
-                    res = json.loads(self.vosk_recognizer.Result())
-                    text = res.get("text", "").strip()
-                    if text:
-                        text_result = text
-                        break
-
-            if not text_result:
-                res = json.loads(self.vosk_recognizer.FinalResult())
-                text_result = res.get("text", "").strip()
+        # Ends early once the word is final or the partial result stops changing
+        text_result = self.voice_listener.listen(timeout=timeout, cancel=cancel)
+        if text_result is None:
+            return None
 
-        print(f"Vosk raw text: '{text_result}'")
+        listener = self.voice_listener
+        self.perf.add('voice', listener.last_latency)
+        print(f"Vosk raw text: '{text_result}' ({listener.last_endpoint}, "
+              f"{listener.last_latency * 1000:.0f} ms)")
 
         if not text_result:
             print("No voice detected.")
             return None
 
-        letters = [ch.upper() for ch in text_result if ch.isalpha()]
-        if not letters:
+        # Letter names only mean letters when Vosk decodes against the grammar
+        word = text_to_word(text_result, self.voice_words, letter_names=VOICE_GRAMMAR)
+        if not word:
             print("No letters found in voice text.")
             return None
 
-        word = ''.join(letters)
-
         # Enforce max length
         if len(word) > MAX_VOICE_LETTERS:
             print(f"Voice word too long ({len(word)} letters). Truncating to first {MAX_VOICE_LETTERS}.")
@@ -376,116 +651,125 @@ class HandSignRecognizer:
         print(f"Voice word letters: {word}")
         return word
 
-    # ============== Servo + overlay ==============
-    def play_word_on_servo_with_overlay(self, word):
+    # ============== Voice+Servo job ==============
+    def start_voice_servo_job(self):
         """
-        2nd program:
-        - full black background
-        - show whole word in center
-        - below that, show current letter
-        - drive servo for each letter (A–Z) with LETTER_INTERVAL_SEC delay
+        2nd program, run in the background (see voice_servo.py):
+        listen for a word, then drive the servo for each letter (A–Z)
+        while the main loop shows the word overlay and keeps handling buttons.
+        A job that is still running is cancelled and joined first, so the old
+        and new job never share the recognizer or the servo sequencer.
         """
-        word = word.strip().upper()
-        if not word:
-            print("No word to play on servo.")
-            return
-
-        if self.ser is None:
-            print("⚠️ No serial connected, cannot drive servos.")
+        self.cancel_voice_servo_job(wait=True)
+        self.voice_job = VoiceServoJob(
+            listen=lambda cancel: self.listen_for_voice_word(timeout=4.0, cancel=cancel),
+            play_letter=self.play_servo_letter,
+            on_word=self.on_voice_word,
+            on_cancel=lambda: self.send_servo_command("REL"),
+        ).start()
+
+    def cancel_voice_servo_job(self, wait=False):
+        """Cancel the current job; wait=True also joins its thread (it exits within ~100 ms)."""
+        if self.voice_job is None:
             return
-
-        # Get frame size from camera, fall back if needed
-        H = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 720)
-        W = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 1280)
-
+        if self.voice_job.active:
+            print("⏹️ Cancelling Voice+Servo sequence")
+        # Also for a job that just finished: its thread may still be in its last step
+        self.voice_job.cancel(wait=wait)
+
+    def voice_job_active(self):
+        return self.voice_job is not None and self.voice_job.active
+
+    def on_voice_word(self, word):
+        # show in first program's word buffer
+        self.detected_words = list(word)
+        print(f"📥 New word from voice: {word}")
         print(f"🎬 Playing word on servo: {word}")
 
-        for ch in word:
-            if not ch.isalpha():
-                continue
-
-            black = np.zeros((H, W, 3), dtype=np.uint8)
-
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            scale = 3
-            thickness = 4
-            text_size, _ = cv2.getTextSize(word, font, scale, thickness)
-            text_w, text_h = text_size
-            x = (W - text_w) // 2
-            y = (H + text_h) // 2
-
-            # Draw the whole word in white
-            cv2.putText(black, word, (x, y), font, scale, (255, 255, 255), thickness, cv2.LINE_AA)
-
-            # Show current letter in green below
-            current_text = f"Letter: {ch}"
-            cv2.putText(black, current_text, (x, y + 80), font, 1.2, (0, 255, 0), 2, cv2.LINE_AA)
-
-            cv2.imshow(self.window_name, black)
-            cv2.waitKey(10)
-
-            # Send letter to ESP32 (servo sequence)
-            self.send_servo_command(ch)
-            # Wait at least LETTER_INTERVAL_SEC seconds for this letter
-            time.sleep(LETTER_INTERVAL_SEC)
+    def play_servo_letter(self, ch, cancel):
+        """Play one letter and wait for the ESP32's completion line (or its timeout) unless cancelled."""
+        if not self.servo.play(ch, cancel):
+            return False
+        return not cancel.wait(LETTER_HOLD_SEC)
 
-        print("✅ Finished playing word on servo.")
+    def render_voice_overlay(self, shape):
+        """
+        Full black background with the whole word in the center and the
+        current letter below it (or 'Listening...' before a word arrived).
+        """
+        H, W = shape[:2]
+        state, word, index, message = self.voice_job.snapshot()
+        black = np.zeros((H, W, 3), dtype=np.uint8)
+
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        scale = 3
+        thickness = 4
+        if state == LISTENING and not self.startup.is_ready('vosk'):
+            message = "Loading voice model..."
+        title = word if word else message
+        text_size, _ = cv2.getTextSize(title, font, scale, thickness)
+        text_w, text_h = text_size
+        x = (W - text_w) // 2
+        y = (H + text_h) // 2
+
+        # Draw the whole word in white
+        cv2.putText(black, title, (x, y), font, scale, (255, 255, 255), thickness, cv2.LINE_AA)
+
+        # Show current letter in green below
+        if word:
+            cv2.putText(black, message, (x, y + 80), font, 1.2, (0, 255, 0), 2, cv2.LINE_AA)
+
+        cv2.putText(black, "BTN1 = Quit | BTN2 = Restart",
+                    (20, H - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        return black
 
     # ============== Serial button polling ==========
     def poll_serial_buttons(self):
         """
-        Reads lines from ESP32:
+        Handles button events queued by the serial reader thread (never blocks):
 
         - 'BTN1' -> Quit program (escape)
         - 'BTN2' -> 2nd program: voice word + black screen + servo, then return to main
         - 'BTN3' -> clear current word
         - 'BTN4' -> speak current word
+
+        Sequence status lines were already passed to the servo sequencer by the
+        reader thread; firmware log lines are ignored here.
         """
-        if self.ser is None:
+        if self.serial_link is None:
             return
-        try:
-            while self.ser.in_waiting:
-                line = self.ser.readline().decode(errors='ignore').strip()
-                if not line:
-                    break
-
+        for event in self.serial_link.get_events():
+            if event.kind != 'button':
                 # Debug:
-                # print("From ESP:", line)
-
-                if line.startswith("BTN1"):
-                    # Button 1: Quit the Python program
-                    print("ESP Button1 -> Quit program")
-                    self.running = False
-                    return  # stop handling more lines this frame
-
-                elif line.startswith("BTN2"):
-                    # Button 2: 2nd program (voice word + servo + full-screen)
-                    print("ESP Button2 -> Voice+Servo mode")
-                    word = self.listen_for_voice_word(timeout=4.0)
-                    if word:
-                        # show in first program's word buffer
-                        self.detected_words = list(word)
-                        print(f"📥 New word from voice: {word}")
-                        # run 2nd program (this will block for a while, then return)
-                        self.play_word_on_servo_with_overlay(word)
-                    else:
-                        print("No valid word from voice.")
-
-                elif line.startswith("BTN3"):
-                    # Button 3: clear word
-                    print("ESP Button3 -> clear word")
-                    self.detected_words.clear()
-
-                elif line.startswith("BTN4"):
-                    # Button 4: speak word
-                    if self.detected_words:
-                        word = ''.join(self.detected_words)
-                        print(f"ESP Button4 -> speak: {word}")
-                        self.speak_text(word)
-                    else:
-                        print("ESP Button4 -> no word to speak")
-        except serial.SerialException as e:
-            print("Serial read error:", e)
+                # print("From ESP:", event.line)
+                continue
+
+            if event.value == 1:
+                # Button 1: Quit the Python program
+                print("ESP Button1 -> Quit program")
+                self.cancel_voice_servo_job()
+                self.running = False
+                return  # stop handling more events this frame
+
+            elif event.value == 2:
+                # Button 2: 2nd program (voice word + servo + full-screen)
+                print("ESP Button2 -> Voice+Servo mode")
+                # Runs in the background; a job already in flight is aborted
+                self.start_voice_servo_job()
+
+            elif event.value == 3:
+                # Button 3: clear word
+                print("ESP Button3 -> clear word")
+                self.detected_words.clear()
+
+            elif event.value == 4:
+                # Button 4: speak word
+                if self.detected_words:
+                    word = ''.join(self.detected_words)
+                    print(f"ESP Button4 -> speak: {word}")
+                    self.speak_text(word, replace=True)
+                else:
+                    print("ESP Button4 -> no word to speak")
 
     # ============== Main loop ======================
     def run(self):
@@ -499,8 +783,18 @@ class HandSignRecognizer:
 
         self.running = True
 
+        if PIPELINED_MODE:
+            self.run_pipelined()
+        else:
+            self.run_serial()
+
+        self.cleanup()
+
+    def run_serial(self):
+        """Capture, process and display each frame in turn on one thread."""
+        loop_start = time.perf_counter()
         while self.running:
-            ret, frame = self.cap.read()
+            ret, frame = self.perf.timed('capture', self.cap.read)
             if not ret:
                 print("Camera frame not received. Check camera index.")
                 break
@@ -508,35 +802,109 @@ class HandSignRecognizer:
             frame = cv2.flip(frame, 1)
 
             # Handle incoming button messages from ESP
-            self.poll_serial_buttons()
+            self.perf.timed('serial', self.poll_serial_buttons)
             if not self.running:
                 break
 
-            frame = self.process_frame(frame)
-            cv2.imshow(self.window_name, frame)
+            if self.voice_job_active():
+                frame = self.render_voice_overlay(frame.shape)
+            else:
+                frame = self.process_frame(frame)
+            key = self.perf.timed('display', self.show_frame, frame)
+
+            now = time.perf_counter()
+            self.perf.add('loop', now - loop_start)
+            loop_start = now
 
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q') or key == ord('Q'):
-                print("Keyboard 'q' pressed -> Quit program")
+            if not self.handle_key(key):
                 break
-            elif key == 13:  # Enter => add space
-                self.detected_words.append(' ')
-                print("Added space from keyboard.")
-            elif key == ord('c'):
-                self.detected_words.clear()
-            elif key == ord('s'):
-                if self.detected_words:
-                    self.speak_text(''.join(self.detected_words))
 
-        self.cleanup()
+    def run_pipelined(self):
+        """
+        Capture and inference run on their own threads (see frame_pipeline.py);
+        this thread renders the newest analyzed frame and handles buttons/keys.
+        """
+        self.pipeline = FramePipeline(self.cap, self.analyze_frame, perf=self.perf)
+        self.pipeline.start()
+        loop_start = time.perf_counter()
+        try:
+            while self.running and self.pipeline.running:
+                # Handle incoming button messages from ESP
+                self.perf.timed('serial', self.poll_serial_buttons)
+                if not self.running:
+                    break
+
+                # Don't confirm signed letters while the voice word is being handled
+                self.pipeline.paused = self.voice_job_active()
+                if self.pipeline.paused:
+                    key = self.show_frame(self.render_voice_overlay(self._frame_shape), delay=30)
+                    if not self.handle_key(key):
+                        break
+                    continue
+
+                item = self.pipeline.get_result(timeout=0.05)
+                if item is not None:
+                    frame, analysis = item
+                    self._frame_shape = frame.shape
+                    frame = self.perf.timed('render', self.render_frame, frame, analysis)
+                    key = self.perf.timed('display', self.show_frame, frame)
+
+                    now = time.perf_counter()
+                    self.perf.add('loop', now - loop_start)
+                    loop_start = now
+                else:
+                    key = cv2.waitKey(1) & 0xFF
+
+                if not self.handle_key(key):
+                    break
+        finally:
+            self.pipeline.stop()
+            print("⏱️ Pipeline stages:", self.pipeline.stage_summary())
+            self.pipeline = None
+
+    def show_frame(self, frame, delay=1):
+        """imshow + waitKey, returns the pressed key code."""
+        cv2.imshow(self.window_name, frame)
+        return cv2.waitKey(delay) & 0xFF
+
+    def handle_key(self, key):
+        """Keyboard shortcuts. Returns False when the user asked to quit."""
+        if key == ord('q') or key == ord('Q'):
+            print("Keyboard 'q' pressed -> Quit program")
+            self.cancel_voice_servo_job()
+            return False
+        elif key == ord('p') or key == ord('P'):
+            self.show_perf = not self.show_perf
+        elif key == 13:  # Enter => add space
+            self.detected_words.append(' ')
+            print("Added space from keyboard.")
+        elif key == ord('c'):
+            self.detected_words.clear()
+        elif key == ord('s'):
+            if self.detected_words:
+                self.speak_text(''.join(self.detected_words), replace=True)
+        return True
 
     def cleanup(self):
+        self.cancel_voice_servo_job(wait=True)
         if self.cap:
             self.cap.release()
         cv2.destroyAllWindows()
-        if self.ser:
-            self.ser.close()
+        if self.voice_listener:
+            self.voice_listener.stop()
+        if self.serial_link:
+            self.serial_link.stop()
             print("Serial closed.")
+        if self.tts:
+            print("🔊 TTS:", self.tts.metrics())
+            self.tts.stop()
+        if self.prediction_log is not None:
+            self.prediction_log.close()
+        print("⏱️ Startup:", self.startup.report())
+        self.startup.shutdown()
+        if PERF_DUMP_PATH:
+            self.perf.dump(PERF_DUMP_PATH)
+            print(f"⏱️ Performance stats written to {PERF_DUMP_PATH}")
         print("Final words:", ''.join(self.detected_words))
 
 
@@ -0,0 +1,248 @@
+"""
+Headless benchmark: replay a recorded video or an image directory through
+HandSignRecognizer's frame processing, without webcam, TTS, ESP32 or Vosk.
+
+    python benchmark.py --video clip.mp4
+    python benchmark.py --images ./data --limit 500 --json bench.json
+    python benchmark.py --video clip.mp4 --compare-roi
+    python benchmark.py --video clip.mp4 --compare-smoothing
+
+Reports per-stage latency percentiles (preprocess, MediaPipe, features,
+classifier, debounce, drawing), end-to-end FPS and the letters the debounce
+logic confirmed, so regressions can be caught on a Linux CI box.
+--compare-roi replays the same frames with full-frame MediaPipe and with ROI
+tracking (roi_tracker.py) and reports both latencies plus how often the two
+paths classified a frame the same way. --compare-smoothing runs with and
+without landmark smoothing / prediction caching (temporal_filter.py) and
+reports classifier calls saved, frame-to-frame label flips and when each
+letter was confirmed.
+
+Frames are timestamped with a clock derived from --fps, not wall time, so
+time-based letter confirmation behaves as it would live.
+"""
+import argparse
+import json
+import os
+import time
+
+import cv2
+
+from app import HandSignRecognizer
+from dataset_builder import IMAGE_EXTENSIONS
+
+STAGES = ('preprocess', 'roi_crop', 'mediapipe', 'features', 'classifier', 'debounce', 'drawing', 'frame')
+
+
+class HeadlessRecognizer(HandSignRecognizer):
+    """HandSignRecognizer with camera, TTS, Vosk and serial replaced by stand-ins."""
+
+    def __init__(self):
+        self.spoken = []
+        self.servo_commands = []
+        super().__init__()
+        # Frames must be classified from the first one on
+        self.startup.wait_all()
+        # Fixed quality so runs stay comparable across machines
+        self.quality = None
+
+    def setup_tts(self):
+        pass
+
+    def speak_text(self, text, replace=False):
+        self.spoken.append(text)
+
+    def setup_camera(self):
+        self.cap = None
+        self.setup_hands()
+
+    def setup_vosk(self):
+        pass
+
+    def setup_serial(self):
+        pass
+
+    def send_servo_command(self, cmd):
+        self.servo_commands.append(cmd)
+
+
+# ============== Frame sources ==================
+def video_frames(path, flip=False):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise SystemExit(f"❌ Cannot open video: {path}")
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield cv2.flip(frame, 1) if flip else frame
+    finally:
+        cap.release()
+
+
+def image_frames(root, flip=False):
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                paths.append(os.path.join(dirpath, name))
+    for path in paths:
+        frame = cv2.imread(path)
+        if frame is not None:
+            yield cv2.flip(frame, 1) if flip else frame
+
+
+# ============== Run ==================
+def run_benchmark(recognizer, frames, limit=None, warmup=10, draw=True, fps=30.0):
+    """Feed frames through analyze/render; returns a result dict."""
+    emitted = []
+    labels = []
+    n = 0
+    total = 0.0
+    frame_time = [0.0]
+    recognizer.clock = lambda: frame_time[0]
+
+    for i, frame in enumerate(frames):
+        frame_time[0] = i / fps
+        if limit is not None and i >= limit + warmup:
+            break
+        if i == warmup:
+            recognizer.perf.reset()
+            total = 0.0
+            n = 0
+
+        words_before = len(recognizer.detected_words)
+        spoken_before = len(recognizer.spoken)
+
+        start = time.perf_counter()
+        analysis = recognizer.analyze_frame(frame)
+        if draw:
+            recognizer.render_frame(frame, analysis)
+        elapsed = time.perf_counter() - start
+        recognizer.perf.add('frame', elapsed)
+
+        if i >= warmup:
+            total += elapsed
+            n += 1
+        labels.append([hand.label for hand in analysis['hands']])
+        if len(recognizer.spoken) > spoken_before or len(recognizer.detected_words) < words_before:
+            emitted.append({'frame': i, 'time_s': frame_time[0], 'status': analysis['status']})
+
+    summary = recognizer.perf.summary()
+    cache = recognizer.prediction_cache
+    return {
+        'frames': n,
+        'total_s': total,
+        'fps': n / total if total > 0 else 0.0,
+        'stages': {stage: summary[stage] for stage in STAGES if stage in summary},
+        'emitted': emitted,
+        'spoken': list(recognizer.spoken),
+        'final_word': ''.join(recognizer.detected_words),
+        'labels': labels,
+        'label_flips': label_flips(labels),
+        'classifier_rows': cache.misses if cache is not None else None,
+        'cache_hit_rate': cache.hit_rate if cache is not None else None,
+    }
+
+
+def label_flips(labels):
+    """Frames where the first hand's label changed from the previous frame (hand visible in both)."""
+    return sum(1 for prev, cur in zip(labels, labels[1:]) if prev and cur and prev[0] != cur[0])
+
+
+def label_agreement(reference, other):
+    """Fraction of frames where both runs found the same hands with the same labels."""
+    pairs = list(zip(reference['labels'], other['labels']))
+    if not pairs:
+        return 0.0
+    return sum(a == b for a, b in pairs) / len(pairs)
+
+
+def print_report(result):
+    print(f"\n📊 {result['frames']} frames in {result['total_s']:.2f}s -> {result['fps']:.1f} FPS")
+    print(f"{'stage':>12} {'mean':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}  (ms)")
+    for stage, s in result['stages'].items():
+        print(f"{stage:>12} {s['mean_ms']:8.2f} {s['p50_ms']:8.2f} {s['p90_ms']:8.2f} "
+              f"{s['p99_ms']:8.2f} {s['max_ms']:8.2f}")
+    print(f"🔤 Emitted: {' '.join(e['status'] for e in result['emitted']) or '-'}")
+    print(f"🔀 Label flips between frames: {result['label_flips']}")
+    if result['cache_hit_rate'] is not None:
+        print(f"♻️ Prediction cache hit rate {result['cache_hit_rate'] * 100:.1f}% "
+              f"({result['classifier_rows']} rows classified)")
+    print(f"📝 Final word: {result['final_word']!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded frames through the recognizer")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--video', help="Video file to replay")
+    source.add_argument('--images', help="Directory of images (searched recursively, sorted)")
+    parser.add_argument('--flip', action='store_true', help="Mirror frames like the live app does")
+    parser.add_argument('--limit', type=int, default=None, help="Max frames to measure")
+    parser.add_argument('--warmup', type=int, default=10, help="Frames excluded from the stats")
+    parser.add_argument('--no-draw', action='store_true', help="Skip the render stage")
+    parser.add_argument('--json', default=None, help="Write the results to this JSON file")
+    parser.add_argument('--fps', type=float, default=30.0, help="Frame rate of the recording (timestamps)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--roi', action='store_true', help="Use ROI tracking instead of full-frame MediaPipe")
+    mode.add_argument('--compare-roi', action='store_true', help="Run full-frame and ROI tracking and compare")
+    mode.add_argument('--compare-smoothing', action='store_true',
+                      help="Run with and without landmark smoothing / prediction cache and compare")
+    args = parser.parse_args()
+
+    def run(use_roi, smoothing=True):
+        recognizer = HeadlessRecognizer()
+        # Sized so no measured sample falls out of the rolling window
+        recognizer.perf.capacity = (args.limit or 100000) + args.warmup
+        if use_roi:
+            recognizer.enable_roi_tracking()
+        if not smoothing:
+            recognizer.hand_tracks = None
+            recognizer.prediction_cache = None
+        frames = video_frames(args.video, args.flip) if args.video else image_frames(args.images, args.flip)
+        result = run_benchmark(recognizer, frames, limit=args.limit, warmup=args.warmup,
+                               draw=not args.no_draw, fps=args.fps)
+        result['source'] = args.video or args.images
+        result['roi'] = use_roi
+        if use_roi:
+            result['roi_counts'] = dict(recognizer.roi_tracker.counts)
+        return result
+
+    if args.compare_roi:
+        full = run(False)
+        tracked = run(True)
+        print("\n=== Full frame ===")
+        print_report(full)
+        print("\n=== ROI tracking ===")
+        print_report(tracked)
+        agreement = label_agreement(full, tracked)
+        speedup = tracked['fps'] / full['fps'] if full['fps'] else 0.0
+        print(f"\n🎯 Label agreement {agreement * 100:.1f}% | ROI {speedup:.2f}x full-frame FPS "
+              f"| crop/full/lost frames {tracked['roi_counts']}")
+        result = {'full': full, 'roi': tracked, 'label_agreement': agreement}
+    elif args.compare_smoothing:
+        raw = run(args.roi, smoothing=False)
+        smoothed = run(args.roi, smoothing=True)
+        print("\n=== Raw landmarks, classifier every frame ===")
+        print_report(raw)
+        print("\n=== Smoothed landmarks + prediction cache ===")
+        print_report(smoothed)
+        print("\n⏱️ Confirmations (s): raw "
+              f"{[round(e['time_s'], 2) for e in raw['emitted']]} | smoothed "
+              f"{[round(e['time_s'], 2) for e in smoothed['emitted']]}")
+        saved = (f"classifier rows saved {smoothed['cache_hit_rate'] * 100:.1f}%"
+                 if smoothed['cache_hit_rate'] is not None else "prediction cache off")
+        print(f"🔀 Label flips {raw['label_flips']} -> {smoothed['label_flips']} | {saved}")
+        result = {'raw': raw, 'smoothed': smoothed}
+    else:
+        result = run(args.roi)
+        print_report(result)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
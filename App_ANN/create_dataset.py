@@ -1,50 +1,19 @@
-import os
 import pickle
 
-import mediapipe as mp
-import cv2
-import matplotlib.pyplot as plt
+from dataset_builder import build_dataset, parse_args
+from feature_store import save_dataset
 
 
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-mp_drawing_styles = mp.solutions.drawing_styles
+if __name__ == "__main__":
+    args = parse_args("Build the landmark feature store from the images under ./data")
 
-hands = mp_hands.Hands(static_image_mode=True, min_detection_confidence=0.3)
+    data, labels = build_dataset(args.data_dir, flip=False, workers=args.workers,
+                                 cache_path=args.cache)
 
-DATA_DIR = './data'
+    manifest = save_dataset(args.output, data, labels)
+    print(f"💾 Saved {manifest['num_samples']} samples to {args.output}")
 
-data = []
-labels = []
-for dir_ in os.listdir(DATA_DIR):
-    for img_path in os.listdir(os.path.join(DATA_DIR, dir_)):
-        data_aux = []
-
-        x_ = []
-        y_ = []
-
-        img = cv2.imread(os.path.join(DATA_DIR, dir_, img_path))
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-
-        results = hands.process(img_rgb)
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                for i in range(len(hand_landmarks.landmark)):
-                    x = hand_landmarks.landmark[i].x
-                    y = hand_landmarks.landmark[i].y
-
-                    x_.append(x)
-                    y_.append(y)
-
-                for i in range(len(hand_landmarks.landmark)):
-                    x = hand_landmarks.landmark[i].x
-                    y = hand_landmarks.landmark[i].y
-                    data_aux.append(x - min(x_))
-                    data_aux.append(y - min(y_))
-
-            data.append(data_aux)
-            labels.append(dir_)
-
-f = open('data.pickle', 'wb')
-pickle.dump({'data': data, 'labels': labels}, f)
-f.close()
+    if args.pickle:
+        f = open(args.pickle, 'wb')
+        pickle.dump({'data': data, 'labels': labels}, f)
+        f.close()
@@ -1,57 +1,20 @@
-import os
 import pickle
-import mediapipe as mp
-import cv2
 
-mp_hands = mp.solutions.hands
+from dataset_builder import build_dataset, parse_args
+from feature_store import save_dataset
 
-hands = mp_hands.Hands(
-    static_image_mode=True,
-    min_detection_confidence=0.3
-)
 
-DATA_DIR = './data'
+if __name__ == "__main__":
+    args = parse_args("Build the landmark feature store from ./data, adding a horizontally mirrored copy of every sample")
 
-data = []
-labels = []
+    # Original and mirrored landmarks for every image (one MediaPipe pass per image)
+    data, labels = build_dataset(args.data_dir, flip=True, workers=args.workers,
+                                 cache_path=args.cache)
 
-def process_image(img_rgb, label):
-    results = hands.process(img_rgb)
-    if results.multi_hand_landmarks:
-        for hand_landmarks in results.multi_hand_landmarks:
-            data_aux = []
-            x_ = []
-            y_ = []
+    # Save dataset
+    manifest = save_dataset(args.output, data, labels, extra={'flip_augmented': True})
+    if args.pickle:
+        with open(args.pickle, 'wb') as f:
+            pickle.dump({'data': data, 'labels': labels}, f)
 
-            for lm in hand_landmarks.landmark:
-                x_.append(lm.x)
-                y_.append(lm.y)
-
-            for lm in hand_landmarks.landmark:
-                data_aux.append(lm.x - min(x_))
-                data_aux.append(lm.y - min(y_))
-
-            data.append(data_aux)
-            labels.append(label)
-
-for dir_ in os.listdir(DATA_DIR):
-    class_dir = os.path.join(DATA_DIR, dir_)
-    for img_path in os.listdir(class_dir):
-        img = cv2.imread(os.path.join(class_dir, img_path))
-        if img is None:
-            continue
-
-        # ---------- Original image ----------
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        process_image(img_rgb, dir_)
-
-        # ---------- Horizontally flipped image ----------
-        img_flipped = cv2.flip(img, 1)  # 1 = horizontal flip
-        img_flipped_rgb = cv2.cvtColor(img_flipped, cv2.COLOR_BGR2RGB)
-        process_image(img_flipped_rgb, dir_)
-
-# Save dataset
-with open('data.pickle', 'wb') as f:
-    pickle.dump({'data': data, 'labels': labels}, f)
-
-print("Dataset created with flipped images included!")
+    print(f"Dataset created with flipped images included! ({manifest['num_samples']} samples in {args.output})")
@@ -0,0 +1,190 @@
+"""
+Landmark dataset builder used by create_dataset.py and create_dataset_flip.py.
+
+The image list under ./data/<class>/ is sorted, split into chunks and fed to a
+process pool with one MediaPipe Hands instance per worker. Results come back
+through Pool.imap, so the output order (and content) is identical to a serial
+run with --workers 1.
+
+Per-image results are kept in a LandmarkCache (landmark_cache.pickle), so a
+rebuild only runs MediaPipe on images that are new or changed since the last
+build and reassembles everything else from the cache.
+
+flip=True adds a horizontally mirrored copy of every row. The mirror is
+taken in landmark space (landmark_augment.mirror_features), so each image
+still goes through MediaPipe only once.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from feature_store import DATA_STORE_PATH
+from hand_features import extract_features
+from landmark_augment import mirror_features
+from landmark_cache import LANDMARK_CACHE_PATH, LandmarkCache, file_digest
+
+DATA_DIR = './data'
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+MIN_DETECTION_CONFIDENCE = 0.3
+
+# One MediaPipe Hands per process, created by _init_worker
+_hands = None
+
+
+# ============== Image list ==================
+def list_images(data_dir=DATA_DIR):
+    """Sorted list of (image_path, label) for every image under data_dir/<label>/."""
+    items = []
+    for label in sorted(os.listdir(data_dir)):
+        class_dir = os.path.join(data_dir, label)
+        if not os.path.isdir(class_dir):
+            continue
+        for name in sorted(os.listdir(class_dir)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                items.append((os.path.join(class_dir, name), label))
+    return items
+
+
+# ============== Worker ==================
+def _init_worker(min_detection_confidence=MIN_DETECTION_CONFIDENCE):
+    global _hands
+    _hands = mp.solutions.hands.Hands(
+        static_image_mode=True,
+        min_detection_confidence=min_detection_confidence
+    )
+
+
+def _landmark_rows(img_bgr):
+    results = _hands.process(cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB))
+    if not results.multi_hand_landmarks:
+        return []
+    return extract_features(results.multi_hand_landmarks).tolist()
+
+
+def extract_image(path):
+    """
+    Returns a cache entry for the image: the file's size, mtime and SHA-1,
+    plus 'rows' (one 42-float row per detected hand).
+    """
+    st = os.stat(path)
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    entry = {
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'sha1': file_digest(raw),
+        'rows': [],
+    }
+
+    img = cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        return entry
+
+    entry['rows'] = _landmark_rows(img)
+    return entry
+
+
+# ============== Build ==================
+def _print_progress(done, total, start):
+    elapsed = time.time() - start
+    rate = done / elapsed if elapsed > 0 else 0.0
+    sys.stdout.write(f"\r🔄 {done}/{total} images ({rate:.1f} img/s)")
+    if done == total:
+        sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+def build_dataset(data_dir=DATA_DIR, flip=False, workers=None, chunksize=8, progress=True,
+                  cache_path=LANDMARK_CACHE_PATH):
+    """
+    Run MediaPipe over every image and return (data, labels) as plain lists,
+    ready for feature_store.save_dataset().
+
+    workers=None uses every CPU core, workers=1 runs serially in-process.
+    cache_path=None disables the landmark cache.
+    """
+    items = list_images(data_dir)
+    start = time.time()
+
+    cache = LandmarkCache.load(cache_path, {'min_detection_confidence': MIN_DETECTION_CONFIDENCE}) \
+        if cache_path else LandmarkCache(None)
+
+    entries = {}
+    tasks = []
+    for path, _ in items:
+        entry = cache.lookup(path) if cache_path else None
+        if entry is None:
+            tasks.append(path)
+        else:
+            entries[path] = entry
+
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+    if cache_path:
+        print(f"📦 Landmark cache: {len(entries)} cached, {len(tasks)} to process")
+
+    if not tasks:
+        entry_iter = iter(())
+        pool = None
+    elif workers == 1:
+        _init_worker()
+        entry_iter = map(extract_image, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker)
+        entry_iter = pool.imap(extract_image, tasks, chunksize=chunksize)
+
+    try:
+        for i, (path, entry) in enumerate(zip(tasks, entry_iter), start=1):
+            entries[path] = entry
+            cache.store(path, entry)
+            if progress and (i % 25 == 0 or i == len(tasks)):
+                _print_progress(i, len(tasks), start)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    if cache_path:
+        removed = cache.prune(path for path, _ in items)
+        if removed:
+            print(f"🗑️ Dropped {removed} deleted image(s) from the landmark cache")
+        cache.save()
+
+    # Reassemble in image-list order so cached and fresh runs give identical output
+    data = []
+    labels = []
+    for path, label in items:
+        rows = entries[path]['rows']
+        if flip and rows:
+            rows = rows + mirror_features(rows).tolist()
+        for row in rows:
+            data.append(row)
+            labels.append(label)
+
+    print(f"✅ {len(data)} samples from {len(items)} images "
+          f"in {time.time() - start:.1f}s using {workers} worker(s)")
+    return data, labels
+
+
+def parse_args(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: all cores, 1 = serial)")
+    parser.add_argument('--output', default=DATA_STORE_PATH,
+                        help="Feature store directory to write")
+    parser.add_argument('--pickle', default=None,
+                        help="Also write the legacy data.pickle format to this path")
+    parser.add_argument('--cache', default=LANDMARK_CACHE_PATH,
+                        help="Per-image landmark cache file")
+    parser.add_argument('--no-cache', dest='cache', action='store_const', const=None,
+                        help="Re-run MediaPipe on every image")
+    return parser.parse_args()
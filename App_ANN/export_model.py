@@ -0,0 +1,118 @@
+"""
+Export the trained hand-sign model for TensorFlow-free inference.
+
+Run once after train_classifier.py:
+
+    python export_model.py
+
+It loads improved_hand_model.h5 and label_encoder.pickle, folds the
+BatchNormalization layers (see fast_inference.NumpyEngine), writes the
+layers plus the class labels to hand_model.npz and checks that the exported
+model agrees with Keras. app.py and inference_classifier.py pick the .npz up
+automatically and then start without importing TensorFlow or scikit-learn.
+
+--measure compares cold start time and peak memory of both load paths, each
+in a fresh Python process:
+
+    python export_model.py --measure
+"""
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+
+from fast_inference import (MODEL_PATH, LABELS_PATH, EXPORTED_MODEL_PATH,
+                            NumpyEngine, load_keras_model)
+from hand_features import FEATURE_DIM, FEATURE_VERSION
+
+# Runs in a child process: import + load + one prediction, then report time and peak RSS
+MEASURE_SCRIPT = r"""
+import json, sys, time
+start = time.perf_counter()
+from fast_inference import load_classifier
+engine, labels = load_classifier(exported_path=sys.argv[1] or None)
+engine.predict([[0.0] * {dim}])
+seconds = time.perf_counter() - start
+
+rss_mb = None
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / 1024.0 if sys.platform != 'darwin' else rss / (1024.0 * 1024.0)
+except ImportError:
+    try:
+        import psutil
+        rss_mb = psutil.Process().memory_info().peak_wset / (1024.0 * 1024.0)
+    except (ImportError, AttributeError):
+        pass
+print(json.dumps({{'engine': engine.name, 'seconds': seconds, 'peak_rss_mb': rss_mb,
+                   'tensorflow': 'tensorflow' in sys.modules}}))
+""".format(dim=FEATURE_DIM)
+
+
+def export(model_path=MODEL_PATH, labels_path=LABELS_PATH, output=EXPORTED_MODEL_PATH, check_rows=500):
+    model = load_keras_model(model_path)
+    with open(labels_path, 'rb') as f:
+        classes = list(pickle.load(f)['label_encoder'].classes_)
+
+    engine = NumpyEngine.from_keras_model(model)
+    manifest = engine.save_npz(output, classes, extra={
+        'feature_version': FEATURE_VERSION,
+        'source_model': os.path.basename(model_path),
+    })
+    print(f"✅ Wrote {output} ({os.path.getsize(output) / 1024:.1f} KB, "
+          f"{len(manifest['activations'])} layers, {len(classes)} classes)")
+
+    # Parity check against Keras on feature-like random rows
+    reloaded, labels, _ = NumpyEngine.from_npz(output)
+    rows = np.random.default_rng(0).random((check_rows, engine.input_dim), dtype=np.float32) * 0.3
+    reference = model.predict(rows, verbose=0)
+    probs = reloaded.predict(rows)
+    agree = float(np.mean(probs.argmax(axis=1) == reference.argmax(axis=1)))
+    max_err = float(np.max(np.abs(probs - reference)))
+    print(f"🔍 Argmax agreement with Keras {agree * 100:.1f}% | max probability error {max_err:.2e}")
+    if list(labels.classes_) != [str(c) for c in classes]:
+        raise SystemExit("❌ Class labels did not round-trip")
+    return manifest
+
+
+def measure(exported_path):
+    """Start time / peak RSS of the .h5 path and the .npz path, each in a fresh process."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for name, path in (('h5 (TensorFlow)', ''), ('npz (NumPy only)', exported_path)):
+        out = subprocess.run([sys.executable, '-c', MEASURE_SCRIPT, path and os.path.abspath(path)],
+                             cwd=here, capture_output=True, text=True)
+        if out.returncode != 0:
+            print(f"⚠️ {name} failed:\n{out.stderr.strip()}")
+            continue
+        results[name] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    for name, r in results.items():
+        rss = f"{r['peak_rss_mb']:.0f} MB" if r['peak_rss_mb'] is not None else "n/a"
+        print(f"{name:>18}: load + first prediction {r['seconds']:.2f}s | peak RSS {rss} "
+              f"| tensorflow imported: {r['tensorflow']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the hand-sign model to a NumPy-only .npz")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--labels', default=LABELS_PATH)
+    parser.add_argument('--output', default=EXPORTED_MODEL_PATH)
+    parser.add_argument('--measure', action='store_true',
+                        help="Compare start time and memory of the .h5 and .npz load paths")
+    args = parser.parse_args()
+
+    if not args.measure or not os.path.exists(args.output):
+        export(args.model, args.labels, args.output)
+    if args.measure:
+        measure(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+Lightweight inference engines for the hand-sign MLP.
+
+Keras' model.predict() spends far more time in framework overhead than in the
+actual 42 -> 256 -> 128 -> 64 -> 26 matmuls when it is called on one row per
+frame. NumpyEngine loads the trained model once, folds every
+BatchNormalization layer into the following Dense layer and runs the forward
+pass as plain NumPy matmuls. TFLiteEngine / OnnxEngine expose the same
+predict() interface for other runtimes.
+
+export_model.py writes the folded layers and the label classes to a small
+.npz file (EXPORTED_MODEL_PATH); load_classifier() serves predictions from it
+with only NumPy installed, so the app never has to import TensorFlow or
+scikit-learn.
+
+Run this file directly to compare the engines against Keras:
+
+    python fast_inference.py --model improved_hand_model.h5
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+MODEL_PATH = 'improved_hand_model.h5'
+LABELS_PATH = 'label_encoder.pickle'
+EXPORTED_MODEL_PATH = 'hand_model.npz'
+EXPORT_FORMAT_VERSION = 1
+
+
+# ============== Activations ==================
+def _relu(x):
+    return np.maximum(x, 0.0, out=x)
+
+
+def _softmax(x):
+    x = x - x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+
+def _linear(x):
+    return x
+
+
+ACTIVATIONS = {
+    'relu': _relu,
+    'softmax': _softmax,
+    'linear': _linear,
+    None: _linear,
+}
+
+
+# ============== Engines ==================
+class InferenceEngine:
+    """Common interface: predict(batch) -> class probabilities (n, num_classes)."""
+
+    name = 'base'
+
+    def predict(self, batch):
+        raise NotImplementedError
+
+    def predict_one(self, features):
+        """Classify a single feature row, returns (class_index, confidence)."""
+        probs = self.predict(np.asarray(features, dtype=np.float32).reshape(1, -1))[0]
+        idx = int(np.argmax(probs))
+        return idx, float(probs[idx])
+
+
+class NumpyEngine(InferenceEngine):
+    """Dense forward pass as NumPy matmuls, BatchNormalization already folded in."""
+
+    name = 'numpy'
+
+    def __init__(self, layers):
+        # layers: list of (kernel, bias, activation_name)
+        self.layers = [
+            (np.ascontiguousarray(w, dtype=np.float32),
+             np.ascontiguousarray(b, dtype=np.float32),
+             act)
+            for w, b, act in layers
+        ]
+        self.input_dim = self.layers[0][0].shape[0]
+        self.num_classes = self.layers[-1][0].shape[1]
+
+    @classmethod
+    def from_keras_model(cls, model):
+        """Fold a trained Sequential model (Dense / BatchNormalization / Dropout) into matmuls."""
+        layers = []
+        pending = None  # (scale, shift) of a BatchNormalization waiting for the next Dense
+
+        for layer in model.layers:
+            kind = layer.__class__.__name__
+            config = layer.get_config()
+
+            if kind in ('InputLayer', 'Dropout'):
+                continue
+
+            if kind == 'BatchNormalization':
+                scale, shift = _batchnorm_affine(layer, config)
+                if pending is not None:
+                    scale, shift = pending[0] * scale, pending[1] * scale + shift
+                pending = (scale, shift)
+                continue
+
+            if kind != 'Dense':
+                raise ValueError(f"Unsupported layer for NumpyEngine: {kind}")
+
+            weights = layer.get_weights()
+            kernel = weights[0].astype(np.float64)
+            bias = weights[1].astype(np.float64) if config.get('use_bias', True) \
+                else np.zeros(kernel.shape[1])
+
+            if pending is not None:
+                # Dense(BN(h)) = (h * s + t) @ W + b = h @ (s[:, None] * W) + (t @ W + b)
+                scale, shift = pending
+                bias = shift @ kernel + bias
+                kernel = scale[:, None] * kernel
+                pending = None
+
+            activation = config.get('activation', 'linear')
+            if activation not in ACTIVATIONS:
+                raise ValueError(f"Unsupported activation for NumpyEngine: {activation}")
+            layers.append((kernel, bias, activation))
+
+        if pending is not None:
+            # Trailing BatchNormalization: keep it as a diagonal linear layer
+            scale, shift = pending
+            layers.append((np.diag(scale), shift, 'linear'))
+
+        return cls(layers)
+
+    def save_npz(self, path, classes, extra=None):
+        """
+        Write the folded layers and class labels to path (.npz, no pickles)
+        with a JSON manifest describing the layers. Returns the manifest.
+        """
+        arrays = {}
+        for i, (kernel, bias, _) in enumerate(self.layers):
+            arrays[f'kernel_{i}'] = kernel
+            arrays[f'bias_{i}'] = bias
+        arrays['classes'] = np.asarray([str(c) for c in classes])
+
+        manifest = {
+            'format_version': EXPORT_FORMAT_VERSION,
+            'input_dim': self.input_dim,
+            'num_classes': self.num_classes,
+            'activations': [act or 'linear' for _, _, act in self.layers],
+            'classes': [str(c) for c in classes],
+        }
+        manifest.update(extra or {})
+        arrays['manifest'] = np.asarray(json.dumps(manifest))
+
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+        return manifest
+
+    @classmethod
+    def from_npz(cls, path):
+        """Load an exported model. Returns (engine, ClassLabels, manifest)."""
+        with np.load(path, allow_pickle=False) as npz:
+            manifest = json.loads(str(npz['manifest']))
+            if manifest.get('format_version') != EXPORT_FORMAT_VERSION:
+                raise ValueError(f"{path}: unsupported export format {manifest.get('format_version')}")
+            layers = [(npz[f'kernel_{i}'], npz[f'bias_{i}'], act)
+                      for i, act in enumerate(manifest['activations'])]
+            classes = npz['classes']
+        return cls(layers), ClassLabels(classes), manifest
+
+    def predict(self, batch):
+        x = np.asarray(batch, dtype=np.float32)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        for kernel, bias, activation in self.layers:
+            x = x @ kernel
+            x += bias
+            x = ACTIVATIONS[activation](x)
+        return x
+
+
+class ClassLabels:
+    """The part of sklearn's LabelEncoder the recognizers use, without sklearn."""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes)
+
+    def inverse_transform(self, indices):
+        return self.classes_[np.asarray(indices)]
+
+
+class KerasEngine(InferenceEngine):
+    """Reference engine: the original per-frame model.predict() call (slow, kept for comparison)."""
+
+    name = 'keras'
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict(self, batch):
+        x = np.asarray(batch, dtype=np.float32)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        return self.model.predict(x, verbose=0)
+
+
+class TFLiteEngine(InferenceEngine):
+    """TensorFlow Lite interpreter backend (tflite_runtime or tf.lite)."""
+
+    name = 'tflite'
+
+    def __init__(self, tflite_path):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        self.interpreter = Interpreter(model_path=tflite_path)
+        self.interpreter.allocate_tensors()
+        self.input_index = self.interpreter.get_input_details()[0]['index']
+        self.output_index = self.interpreter.get_output_details()[0]['index']
+        self._batch = None
+
+    @staticmethod
+    def convert(model, tflite_path):
+        """Write a .tflite file for a Keras model."""
+        import tensorflow as tf
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        with open(tflite_path, 'wb') as f:
+            f.write(converter.convert())
+
+    def predict(self, batch):
+        x = np.asarray(batch, dtype=np.float32)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        if self._batch != x.shape[0]:
+            self.interpreter.resize_tensor_input(self.input_index, x.shape)
+            self.interpreter.allocate_tensors()
+            self._batch = x.shape[0]
+        self.interpreter.set_tensor(self.input_index, x)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output_index).copy()
+
+
+class OnnxEngine(InferenceEngine):
+    """onnxruntime backend for a model exported with tf2onnx."""
+
+    name = 'onnx'
+
+    def __init__(self, onnx_path):
+        import onnxruntime as ort
+        self.session = ort.InferenceSession(onnx_path, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict(self, batch):
+        x = np.asarray(batch, dtype=np.float32)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        return self.session.run(None, {self.input_name: x})[0]
+
+
+def _batchnorm_affine(layer, config):
+    """Return (scale, shift) so that BN(x) == x * scale + shift at inference time."""
+    weights = iter(layer.get_weights())
+    gamma = next(weights) if config.get('scale', True) else None
+    beta = next(weights) if config.get('center', True) else None
+    moving_mean = next(weights)
+    moving_var = next(weights)
+
+    scale = 1.0 / np.sqrt(moving_var.astype(np.float64) + config.get('epsilon', 1e-3))
+    if gamma is not None:
+        scale = scale * gamma
+    shift = -moving_mean * scale
+    if beta is not None:
+        shift = shift + beta
+    return scale, shift
+
+
+# ============== Loading ==================
+def load_keras_model(model_path=MODEL_PATH):
+    import tensorflow as tf
+    return tf.keras.models.load_model(model_path)
+
+
+def load_engine(model_path=MODEL_PATH, backend='numpy'):
+    """
+    Load the hand-sign classifier behind the InferenceEngine interface.
+
+    backend: 'numpy' (default), 'keras', 'tflite' or 'onnx'.
+    For 'tflite' / 'onnx' the converted model is expected next to the .h5 file
+    (the .tflite one is converted on first use).
+    """
+    if backend == 'numpy':
+        return NumpyEngine.from_keras_model(load_keras_model(model_path))
+    if backend == 'keras':
+        return KerasEngine(load_keras_model(model_path))
+    if backend == 'tflite':
+        tflite_path = os.path.splitext(model_path)[0] + '.tflite'
+        if not os.path.exists(tflite_path):
+            TFLiteEngine.convert(load_keras_model(model_path), tflite_path)
+        return TFLiteEngine(tflite_path)
+    if backend == 'onnx':
+        return OnnxEngine(os.path.splitext(model_path)[0] + '.onnx')
+    raise ValueError(f"Unknown inference backend: {backend}")
+
+
+def load_classifier(model_path=MODEL_PATH, labels_path=LABELS_PATH, backend='numpy',
+                    exported_path=EXPORTED_MODEL_PATH):
+    """
+    Return (engine, label_encoder) for the recognizers.
+
+    With the numpy backend the exported .npz is used when it exists, which
+    needs neither TensorFlow nor scikit-learn. Otherwise the .h5 model and the
+    pickled LabelEncoder are loaded as before.
+    """
+    if backend == 'numpy' and exported_path and os.path.exists(exported_path):
+        if os.path.exists(model_path) and os.path.getmtime(model_path) > os.path.getmtime(exported_path):
+            print(f"⚠️ {model_path} is newer than {exported_path}, re-run export_model.py")
+        engine, labels, _ = NumpyEngine.from_npz(exported_path)
+        engine.name = 'numpy-npz'
+        return engine, labels
+
+    import pickle
+    engine = load_engine(model_path, backend=backend)
+    with open(labels_path, 'rb') as f:
+        label_encoder = pickle.load(f)['label_encoder']
+    return engine, label_encoder
+
+
+# ============== Benchmark ==================
+def time_engine(engine, rows, repeats):
+    """Median per-call latency (ms) for single-row predictions."""
+    timings = []
+    for _ in range(repeats):
+        for row in rows:
+            start = time.perf_counter()
+            engine.predict(row[None, :])
+            timings.append(time.perf_counter() - start)
+    return 1000.0 * float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare hand-sign inference engines against Keras")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--tflite', default=None, help="Also benchmark a .tflite model (converted if missing)")
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    model = load_keras_model(args.model)
+    rng = np.random.default_rng(0)
+    rows = rng.random((args.rows, model.input_shape[-1]), dtype=np.float32) * 0.3
+
+    engines = [NumpyEngine.from_keras_model(model)]
+    if args.tflite:
+        if not os.path.exists(args.tflite):
+            TFLiteEngine.convert(model, args.tflite)
+        engines.append(TFLiteEngine(args.tflite))
+
+    reference = model.predict(rows, verbose=0)
+    ref_classes = reference.argmax(axis=1)
+
+    # model.predict is slow enough that a few dozen calls give a stable median
+    predict_ms = time_engine(KerasEngine(model), rows[:30], 1)
+    print(f"{'keras':>14}: {predict_ms:8.3f} ms/call (model.predict reference)")
+
+    for engine in engines:
+        probs = engine.predict(rows)
+        agree = float(np.mean(probs.argmax(axis=1) == ref_classes))
+        max_err = float(np.max(np.abs(probs.max(axis=1) - reference.max(axis=1))))
+        ms = time_engine(engine, rows, args.repeats)
+        print(f"{engine.name:>14}: {ms:8.3f} ms/call | argmax agreement {agree * 100:.1f}% "
+              f"| max confidence error {max_err:.2e} | {predict_ms / ms:.0f}x faster")
+
+
+if __name__ == "__main__":
+    main()
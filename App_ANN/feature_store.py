@@ -0,0 +1,142 @@
+"""
+Compact columnar dataset format replacing data.pickle.
+
+A feature store is a directory:
+
+    data_store/
+        features.npy    float32 (N, 42) landmark features
+        labels.npy      int32 (N,) index into manifest['classes']
+        manifest.json   format version, feature definition, class table
+
+Both arrays are plain .npy files, so load_dataset() can memory-map them
+(np.load(mmap_mode='r')) instead of unpickling millions of float objects.
+Classes are stored sorted, which makes the integer labels identical to what
+sklearn's LabelEncoder produces for the same label strings.
+
+Migrate an existing pickle with:
+
+    python feature_store.py data.pickle data_store
+"""
+import argparse
+import json
+import os
+import pickle
+
+import numpy as np
+
+from hand_features import FEATURE_VERSION
+
+DATA_STORE_PATH = 'data_store'
+LEGACY_PICKLE_PATH = 'data.pickle'
+
+FORMAT_VERSION = 1
+FEATURES_FILE = 'features.npy'
+LABELS_FILE = 'labels.npy'
+MANIFEST_FILE = 'manifest.json'
+
+
+# ============== Write ==================
+def encode_labels(labels):
+    """String labels -> (sorted class table, int32 label indices)."""
+    classes, indices = np.unique(np.asarray(labels), return_inverse=True)
+    return [str(c) for c in classes], indices.astype(np.int32)
+
+
+def save_dataset(path, data, labels, feature_version=FEATURE_VERSION, extra=None):
+    """Write features / string labels as a feature store directory at path."""
+    features = np.ascontiguousarray(np.asarray(data, dtype=np.float32))
+    if features.ndim < 2:
+        # An empty list has no trailing shape to record in the manifest
+        raise ValueError(f"Expected (n, ...) feature rows, got shape {features.shape}")
+    classes, indices = encode_labels(labels)
+    if len(indices) != len(features):
+        raise ValueError(f"{len(features)} feature rows but {len(indices)} labels")
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, FEATURES_FILE), features)
+    np.save(os.path.join(path, LABELS_FILE), indices)
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'feature_version': feature_version,
+        'feature_shape': list(features.shape[1:]),
+        'dtype': 'float32',
+        'num_samples': int(len(features)),
+        'classes': classes,
+    }
+    if extra:
+        manifest.update(extra)
+
+    # Manifest last: a store without one is an interrupted write
+    with open(os.path.join(path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+# ============== Read ==================
+def load_manifest(path):
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported feature store version {manifest.get('format_version')} in {path}")
+    return manifest
+
+
+def load_store(path, mmap=True, feature_version=FEATURE_VERSION):
+    """
+    Load a feature store directory. Returns (features, labels, manifest);
+    with mmap=True both arrays are read-only memory maps.
+    """
+    manifest = load_manifest(path)
+    if feature_version is not None and manifest['feature_version'] != feature_version:
+        raise ValueError(f"{path} holds '{manifest['feature_version']}' features, "
+                         f"expected '{feature_version}'. Rebuild the dataset.")
+
+    mmap_mode = 'r' if mmap else None
+    features = np.load(os.path.join(path, FEATURES_FILE), mmap_mode=mmap_mode)
+    labels = np.load(os.path.join(path, LABELS_FILE), mmap_mode=mmap_mode)
+    return features, labels, manifest
+
+
+def load_legacy_pickle(path=LEGACY_PICKLE_PATH):
+    """Read an old data.pickle into the same (features, labels, manifest) shape."""
+    with open(path, 'rb') as f:
+        data_dict = pickle.load(f)
+    features = np.asarray(data_dict['data'], dtype=np.float32)
+    classes, labels = encode_labels(data_dict['labels'])
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'feature_version': FEATURE_VERSION,
+        'feature_shape': list(features.shape[1:]),
+        'dtype': 'float32',
+        'num_samples': int(len(features)),
+        'classes': classes,
+    }
+    return features, labels, manifest
+
+
+def load_dataset(path=None, mmap=True):
+    """
+    Load training data from a feature store directory or a legacy pickle.
+    With no path, prefers ./data_store and falls back to ./data.pickle.
+    """
+    if path is None:
+        path = DATA_STORE_PATH if os.path.isdir(DATA_STORE_PATH) else LEGACY_PICKLE_PATH
+    if os.path.isdir(path):
+        return load_store(path, mmap=mmap)
+    return load_legacy_pickle(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a legacy data.pickle into a feature store")
+    parser.add_argument('source', nargs='?', default=LEGACY_PICKLE_PATH)
+    parser.add_argument('dest', nargs='?', default=DATA_STORE_PATH)
+    args = parser.parse_args()
+
+    features, labels, manifest = load_legacy_pickle(args.source)
+    save_dataset(args.dest, features, np.asarray(manifest['classes'])[labels])
+    print(f"✅ Wrote {len(features)} samples, {len(manifest['classes'])} classes to {args.dest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Threaded capture -> inference -> render pipeline for HandSignRecognizer.
+
+    capture thread    cap.read() + flip, always overwrites the newest frame
+    inference thread  MediaPipe + classifier + debounce (analyze callback)
+    render (caller)   drawing + imshow on the main thread (OpenCV GUI calls
+                      must stay on the main thread)
+
+Stages are connected by single-slot queues that keep only the latest item,
+so a slow stage drops stale frames instead of queueing them, and throughput
+is bound by the slowest stage rather than the sum of all of them.
+"""
+import threading
+import time
+
+import cv2
+
+from perf import PerfStats
+
+
+class LatestSlot:
+    """Bounded single-slot queue: put() replaces any unread item, get() blocks."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._has_item = False
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._has_item:
+                self.dropped += 1
+            self._item = item
+            self._has_item = True
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Return the newest item, or None on timeout / close."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._has_item or self._closed, timeout):
+                return None
+            if not self._has_item:
+                return None
+            item = self._item
+            self._item = None
+            self._has_item = False
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class FramePipeline:
+    def __init__(self, cap, analyze, flip=True, perf=None):
+        """
+        cap:     opened cv2.VideoCapture
+        analyze: callable(frame) -> analysis, run on the inference thread
+        perf:    PerfStats receiving 'capture' / 'inference' timings
+        """
+        self.cap = cap
+        self.analyze = analyze
+        self.flip = flip
+        self.times = perf if perf is not None else PerfStats()
+
+        self.frames = LatestSlot()
+        self.results = LatestSlot()
+        self.running = False
+        self.camera_ok = True
+        # While paused, frames are still captured but not analyzed
+        self.paused = False
+        self._threads = []
+
+    # ============== Lifecycle ==================
+    def start(self):
+        # Ask the driver not to hold a backlog of stale frames (ignored by some backends)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.running = True
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="inference", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self):
+        self.running = False
+        self.frames.close()
+        self.results.close()
+        for t in self._threads:
+            t.join(timeout=2.0)
+        self._threads = []
+
+    # ============== Stages ==================
+    def _capture_loop(self):
+        while self.running:
+            start = time.perf_counter()
+            ret, frame = self.cap.read()
+            if not ret:
+                print("Camera frame not received. Check camera index.")
+                self.camera_ok = False
+                self.running = False
+                self.frames.close()
+                self.results.close()
+                return
+            if self.flip:
+                frame = cv2.flip(frame, 1)
+            self.times.add('capture', time.perf_counter() - start)
+            self.frames.put(frame)
+
+    def _inference_loop(self):
+        while self.running:
+            frame = self.frames.get(timeout=0.5)
+            if frame is None or self.paused:
+                continue
+            start = time.perf_counter()
+            analysis = self.analyze(frame)
+            self.times.add('inference', time.perf_counter() - start)
+            self.results.put((frame, analysis))
+
+    def get_result(self, timeout=0.5):
+        """(frame, analysis) for the render stage, or None if nothing new arrived."""
+        return self.results.get(timeout=timeout)
+
+    def stage_summary(self):
+        parts = [f"{stage} {s['mean_ms']:.1f}ms" for stage, s in self.times.summary().items()]
+        return " | ".join(parts) + f" | dropped {self.frames.dropped} captured / {self.results.dropped} analyzed"
@@ -0,0 +1,41 @@
+"""
+Per-hand classification shared by app.py and inference_classifier.py.
+
+classify_hands() runs one model call for every detected hand and returns a
+HandPrediction per hand. app.py adds landmark smoothing, the prediction cache
+and the sequence model around the same two steps (decode_probs and
+make_predictions), so both recognizers report hands the same way.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from hand_features import stack_points, points_to_features, points_to_boxes
+
+# One classified hand per entry, in MediaPipe order
+HandPrediction = namedtuple('HandPrediction', ['label', 'confidence', 'bbox', 'landmarks'])
+
+
+def decode_probs(probs, label_encoder):
+    """(n, num_classes) probabilities -> (labels, confidences) of the best class per row."""
+    classes = probs.argmax(axis=1)
+    confidences = probs[np.arange(len(classes)), classes]
+    return label_encoder.inverse_transform(classes), confidences
+
+
+def make_predictions(labels, confidences, boxes, multi_hand_landmarks):
+    return [
+        HandPrediction(label, float(conf), box, hand_landmarks)
+        for label, conf, box, hand_landmarks
+        in zip(labels, confidences, boxes, multi_hand_landmarks)
+    ]
+
+
+def classify_hands(model, label_encoder, multi_hand_landmarks, side):
+    """Classify every detected hand with a single model call. Returns a list of HandPrediction."""
+    points = stack_points(multi_hand_landmarks)
+    features = points_to_features(points)
+    boxes = points_to_boxes(points, side).tolist()
+
+    labels, confidences = decode_probs(model.predict(features), label_encoder)
+    return make_predictions(labels, confidences, boxes, multi_hand_landmarks)
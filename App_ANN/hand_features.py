@@ -0,0 +1,57 @@
+"""
+Landmark feature extraction shared by the dataset builders and the live app.
+
+A feature row is the 21 MediaPipe hand landmarks as (x, y) pairs, each axis
+shifted so that its minimum is 0:
+
+    [x0 - min(x), y0 - min(y), x1 - min(x), y1 - min(y), ...]   (42 floats)
+
+Training (create_dataset*.py) and serving (app.py, inference_classifier.py)
+both go through points_to_features(), so the two can never drift apart.
+"""
+import numpy as np
+
+NUM_LANDMARKS = 21
+FEATURE_DIM = NUM_LANDMARKS * 2
+
+# Bump when the feature definition changes; stored alongside saved datasets
+FEATURE_VERSION = "xy-minus-min-v1"
+
+
+def landmarks_to_points(hand_landmarks):
+    """NormalizedLandmarkList -> (21, 2) float32 array of (x, y)."""
+    return np.fromiter(
+        (v for lm in hand_landmarks.landmark for v in (lm.x, lm.y)),
+        dtype=np.float32, count=FEATURE_DIM
+    ).reshape(NUM_LANDMARKS, 2)
+
+
+def stack_points(multi_hand_landmarks):
+    """One NormalizedLandmarkList or a sequence of them -> (n_hands, 21, 2) float32."""
+    if hasattr(multi_hand_landmarks, 'landmark'):
+        multi_hand_landmarks = [multi_hand_landmarks]
+    points = np.empty((len(multi_hand_landmarks), NUM_LANDMARKS, 2), dtype=np.float32)
+    for i, hand_landmarks in enumerate(multi_hand_landmarks):
+        points[i] = landmarks_to_points(hand_landmarks)
+    return points
+
+
+def points_to_features(points):
+    """(n, 21, 2) landmark points -> (n, 42) min-shifted feature matrix."""
+    points = np.asarray(points, dtype=np.float32)
+    if points.ndim == 2:
+        points = points[None]
+    return (points - points.min(axis=1, keepdims=True)).reshape(len(points), FEATURE_DIM)
+
+
+def extract_features(multi_hand_landmarks):
+    """MediaPipe landmarks (one hand or a list of hands) -> (n_hands, 42) feature matrix."""
+    return points_to_features(stack_points(multi_hand_landmarks))
+
+
+def points_to_boxes(points, side, margin=20):
+    """(n, 21, 2) normalized points -> (n, 4) int pixel boxes (x1, y1, x2, y2) with a margin."""
+    mins = points.min(axis=1) * side
+    maxs = points.max(axis=1) * side
+    boxes = np.concatenate([mins.astype(np.int32) - margin, maxs.astype(np.int32) + margin], axis=1)
+    return boxes
@@ -1,9 +1,9 @@
-import pickle
 import cv2
 import mediapipe as mp
 import numpy as np
-import tensorflow as tf
 import winspeech
+from fast_inference import load_classifier
+from hand_classifier import classify_hands
 from collections import deque
 import threading
 
@@ -55,9 +55,8 @@ class HandSignRecognizer:
 
     # ================= MODEL =================
     def load_model(self):
-        self.model = tf.keras.models.load_model('improved_hand_model.h5')
-        label_dict = pickle.load(open('label_encoder.pickle', 'rb'))
-        self.label_encoder = label_dict['label_encoder']
+        # hand_model.npz (export_model.py) when present, otherwise the .h5 via TensorFlow
+        self.model, self.label_encoder = load_classifier('improved_hand_model.h5', 'label_encoder.pickle')
 
         print("✅ Model loaded")
         print("📊 Classes:", list(self.label_encoder.classes_))
@@ -91,6 +90,11 @@ class HandSignRecognizer:
 
         return all(x == char and x is not None for x in self.frame_history)
 
+    # ================= CLASSIFY HANDS =================
+    def classify_hands(self, multi_hand_landmarks, side):
+        """Classify every detected hand with a single model call (hand_classifier.py)."""
+        return classify_hands(self.model, self.label_encoder, multi_hand_landmarks, side)
+
     # ================= FRAME PROCESS =================
     def process_frame(self, frame):
         H, W = frame.shape[:2]
@@ -112,75 +116,60 @@ class HandSignRecognizer:
         detection_status = "Show Your Hand"
 
         if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
+            for hand in self.classify_hands(results.multi_hand_landmarks, side):
 
                 self.mp_drawing.draw_landmarks(
                     frame_square,
-                    hand_landmarks,
+                    hand.landmarks,
                     self.mp_hands.HAND_CONNECTIONS,
                     self.mp_drawing_styles.get_default_hand_landmarks_style(),
                     self.mp_drawing_styles.get_default_hand_connections_style()
                 )
 
-                x_ = [lm.x for lm in hand_landmarks.landmark]
-                y_ = [lm.y for lm in hand_landmarks.landmark]
-
-                data_aux = []
-                for lm in hand_landmarks.landmark:
-                    data_aux.append(lm.x - min(x_))
-                    data_aux.append(lm.y - min(y_))
-
-                if len(data_aux) == 42:
-                    prediction = self.model.predict(np.array([data_aux]), verbose=0)
-                    predicted_class = np.argmax(prediction)
-                    confidence = np.max(prediction)
+                confidence = hand.confidence
+                x1, y1, x2, y2 = hand.bbox
 
-                    x1 = int(min(x_) * side) - 20
-                    y1 = int(min(y_) * side) - 20
-                    x2 = int(max(x_) * side) + 20
-                    y2 = int(max(y_) * side) + 20
+                if confidence > 0.5:
+                    predicted_label = hand.label
+                    current_prediction = predicted_label
+                    current_confidence = confidence
 
-                    if confidence > 0.5:
-                        predicted_label = self.label_encoder.inverse_transform([predicted_class])[0]
-                        current_prediction = predicted_label
-                        current_confidence = confidence
+                    box_color = (0, 255, 0) if confidence > self.confidence_threshold else (0, 165, 255)
+                    self.draw_rounded_rect(frame_square, (x1, y1), (x2, y2), box_color, 2, radius=15)
 
-                        box_color = (0, 255, 0) if confidence > self.confidence_threshold else (0, 165, 255)
-                        self.draw_rounded_rect(frame_square, (x1, y1), (x2, y2), box_color, 2, radius=15)
+                    label_text = f'{predicted_label} ({confidence:.2f})'
+                    self.draw_gradient_background(frame_square, label_text, (x1, y1),
+                                                  bg_color=(0, 0, 0), text_color=box_color)
 
-                        label_text = f'{predicted_label} ({confidence:.2f})'
-                        self.draw_gradient_background(frame_square, label_text, (x1, y1),
-                                                      bg_color=(0, 0, 0), text_color=box_color)
+                    self.draw_confidence_bar(frame_square, confidence, (x1, y2 + 10))
 
-                        self.draw_confidence_bar(frame_square, confidence, (x1, y2 + 10))
+                    if confidence >= self.confidence_threshold and self.cooldown_counter == 0:
+                        is_continuous = self.check_continuous_detection(current_prediction, current_confidence)
 
-                        if confidence >= self.confidence_threshold and self.cooldown_counter == 0:
-                            is_continuous = self.check_continuous_detection(current_prediction, current_confidence)
+                        if is_continuous:
 
-                            if is_continuous:
-
-                                # ===== BACKSPACE OR NORMAL CHARACTER =====
-                                if current_prediction == '0':
-                                    self.handle_backspace()
-                                    detection_status = "Backspace"
-                                else:
-                                    self.speak_text(current_prediction)
-                                    self.detected_words.append(current_prediction)
-                                    detection_status = f"Detected: {current_prediction}!"
+                            # ===== BACKSPACE OR NORMAL CHARACTER =====
+                            if current_prediction == '0':
+                                self.handle_backspace()
+                                detection_status = "Backspace"
+                            else:
+                                self.speak_text(current_prediction)
+                                self.detected_words.append(current_prediction)
+                                detection_status = f"Detected: {current_prediction}!"
 
-                                self.last_spoken_char = current_prediction
-                                self.cooldown_counter = self.cooldown_frames
-                                self.frame_history.clear()
+                            self.last_spoken_char = current_prediction
+                            self.cooldown_counter = self.cooldown_frames
+                            self.frame_history.clear()
 
-                                print(f"📝 Current words: {''.join(self.detected_words)}")
+                            print(f"📝 Current words: {''.join(self.detected_words)}")
 
-                            else:
-                                progress = len([x for x in self.frame_history if x == current_prediction and x is not None])
-                                detection_status = f"Detecting: {current_prediction} ({progress}/{self.required_continuous_frames})"
-                        elif self.cooldown_counter > 0:
-                            detection_status = f"Cooldown: {self.cooldown_counter} frames"
                         else:
-                            detection_status = f"Low Confidence: {current_prediction}"
+                            progress = len([x for x in self.frame_history if x == current_prediction and x is not None])
+                            detection_status = f"Detecting: {current_prediction} ({progress}/{self.required_continuous_frames})"
+                    elif self.cooldown_counter > 0:
+                        detection_status = f"Cooldown: {self.cooldown_counter} frames"
+                    else:
+                        detection_status = f"Low Confidence: {current_prediction}"
 
         # ================= UI (UNCHANGED) =================
         cv2.putText(frame_square, f"Words: {''.join(self.detected_words)}",
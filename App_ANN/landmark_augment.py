@@ -0,0 +1,97 @@
+"""
+Data augmentation in landmark space.
+
+create_dataset_flip.py used to get mirrored samples by flipping every image
+and running MediaPipe on it a second time. The same variations can be made
+directly on the 21 (x, y) landmarks of a feature row, for a whole batch at
+once:
+
+  mirror     x -> max(x) - x, exactly what a horizontal image flip gives after
+             the min-shift (a left-handed signer, or the app's mirrored view)
+  rotation   small in-plane rotation around the hand centre
+  scale      overall scale (distance to the camera) plus a small per-axis
+             stretch (camera aspect ratio, viewing angle)
+  noise      per-landmark Gaussian jitter, like MediaPipe's own jitter
+
+Translation is not included: every feature row is shifted so min(x) and
+min(y) are 0, so translating a hand does not change its features.
+
+LandmarkAugmenter draws new random parameters for each row on every call,
+so the training loop sees a fresh variant of each sample every epoch while
+the dataset build stays at one MediaPipe pass per image.
+"""
+import numpy as np
+
+from hand_features import NUM_LANDMARKS, FEATURE_DIM
+
+
+def mirror_features(features):
+    """(n, 42) feature rows -> rows of the horizontally mirrored hands."""
+    points = np.array(features, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 2)
+    points[:, :, 0] = points[:, :, 0].max(axis=1, keepdims=True) - points[:, :, 0]
+    return points.reshape(-1, FEATURE_DIM)
+
+
+class LandmarkAugmenter:
+    def __init__(self, mirror=0.5, max_rotation=15.0, scale=(0.9, 1.1), stretch=0.05, noise=0.002,
+                 seed=None):
+        """
+        mirror:       probability that a row is mirrored
+        max_rotation: rotation drawn uniformly from +-max_rotation degrees
+        scale:        (min, max) overall scale factor
+        stretch:      extra per-axis scale drawn from 1 +- stretch
+        noise:        std of the per-landmark jitter, in normalized coordinates
+        """
+        self.mirror = mirror
+        self.max_rotation = max_rotation
+        self.scale = scale
+        self.stretch = stretch
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+
+    def __call__(self, features, rng=None):
+        """
+        (n, 42) batch -> (n, 42) augmented batch (new random parameters per row).
+        Pass rng when calling from several threads; the default generator is not thread-safe.
+        """
+        points = np.array(features, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 2)
+        n = len(points)
+        rng = self.rng if rng is None else rng
+
+        if self.mirror:
+            # Negated x becomes max(x) - x with the final min-shift
+            points[rng.random(n) < self.mirror, :, 0] *= -1.0
+
+        points -= points.mean(axis=1, keepdims=True)
+
+        # Per-row 2x2 transform: per-axis scale after rotation
+        angle = np.radians(rng.uniform(-self.max_rotation, self.max_rotation, n))
+        cos, sin = np.cos(angle), np.sin(angle)
+        transform = np.empty((n, 2, 2), dtype=np.float32)
+        transform[:, 0, 0], transform[:, 0, 1] = cos, sin
+        transform[:, 1, 0], transform[:, 1, 1] = -sin, cos
+        transform *= (rng.uniform(self.scale[0], self.scale[1], (n, 1))
+                      * rng.uniform(1.0 - self.stretch, 1.0 + self.stretch, (n, 2)))[:, None, :]
+        points = points @ transform
+
+        if self.noise:
+            points += rng.normal(0.0, self.noise, points.shape).astype(np.float32)
+
+        points -= points.min(axis=1, keepdims=True)
+        return points.reshape(n, FEATURE_DIM)
+
+
+def augmented_batches(features, labels, batch_size=32, augmenter=None, shuffle=True, seed=None):
+    """
+    Endless generator of (x, y) batches for model.fit(..., steps_per_epoch=...),
+    each batch augmented on the fly. features may be a memory-mapped array.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(features)
+    while True:
+        order = rng.permutation(n) if shuffle else np.arange(n)
+        for start in range(0, n, batch_size):
+            # Sorted indices keep reads from a memory map sequential
+            index = np.sort(order[start:start + batch_size])
+            x = np.asarray(features[index], dtype=np.float32)
+            yield (augmenter(x) if augmenter is not None else x), np.asarray(labels[index])
@@ -0,0 +1,106 @@
+"""
+Persistent per-image landmark cache for the dataset builders.
+
+Each image under ./data is keyed by its path and remembered with its size,
+mtime and SHA-1 content hash together with the feature rows MediaPipe
+produced for it. A rebuild only re-runs MediaPipe on new or changed images;
+entries for deleted images are dropped when the cache is saved.
+"""
+import hashlib
+import os
+import pickle
+
+from hand_features import FEATURE_VERSION
+
+LANDMARK_CACHE_PATH = 'landmark_cache.pickle'
+
+# Bump when the cache layout changes
+CACHE_VERSION = 2
+
+
+def file_signature(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def file_digest(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+class LandmarkCache:
+    def __init__(self, path=LANDMARK_CACHE_PATH, settings=None):
+        self.path = path
+        # Anything that changes the extracted rows (feature definition, MediaPipe settings)
+        self.settings = dict(settings or {}, feature_version=FEATURE_VERSION)
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path=LANDMARK_CACHE_PATH, settings=None):
+        cache = cls(path, settings)
+        if not os.path.exists(path):
+            return cache
+        try:
+            with open(path, 'rb') as f:
+                stored = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            print(f"⚠️ Ignoring unreadable landmark cache {path}: {e}")
+            return cache
+
+        if stored.get('version') == CACHE_VERSION and stored.get('settings') == cache.settings:
+            cache.entries = stored['entries']
+        else:
+            print("ℹ️ Landmark cache settings changed, rebuilding from scratch")
+        return cache
+
+    def lookup(self, path):
+        """
+        Return the cached entry for path if it is still valid, else None.
+        An entry is valid if size and mtime match, or if the content hash
+        still matches (file touched or copied but not changed).
+        """
+        entry = self.entries.get(path)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        try:
+            size, mtime_ns = file_signature(path)
+        except OSError:
+            self.misses += 1
+            return None
+
+        if (size, mtime_ns) != (entry['size'], entry['mtime_ns']):
+            if size != entry['size']:
+                self.misses += 1
+                return None
+            with open(path, 'rb') as f:
+                if file_digest(f.read()) != entry['sha1']:
+                    self.misses += 1
+                    return None
+            entry['mtime_ns'] = mtime_ns
+
+        self.hits += 1
+        return entry
+
+    def store(self, path, entry):
+        self.entries[path] = entry
+
+    def prune(self, live_paths):
+        """Drop entries for images that no longer exist. Returns how many were removed."""
+        live = set(live_paths)
+        stale = [p for p in self.entries if p not in live]
+        for p in stale:
+            del self.entries[p]
+        return len(stale)
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({
+                'version': CACHE_VERSION,
+                'settings': self.settings,
+                'entries': self.entries,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,234 @@
+"""
+Incremental letter confirmation (debounce) for the live recognizer.
+
+check_continuous_detection() appended to a 20-entry deque and re-scanned it
+with all() every frame, and the status text rebuilt a list over it again.
+The rule itself, "20 equal frames in a row", also made confirmation time
+proportional to frame time: 0.7 s at 30 FPS, 2 s at 10 FPS.
+
+LetterConfirmer keeps only a few accumulators and updates them in O(1) per
+frame. A DebouncePolicy decides how evidence is counted:
+
+  - time_based:  evidence and limits are milliseconds of observation instead
+                 of frame counts
+  - weighted:    each observation adds dt * confidence instead of dt, so a
+                 confident sign confirms sooner than a borderline one
+  - hysteresis:  a new candidate needs enter_threshold, a running one is kept
+                 while confidence stays above stay_threshold; up to max_gap
+                 of a competing letter and max_missing of no / low-confidence
+                 hand are tolerated before the run restarts
+
+POLICIES['frames'] reproduces the old behaviour. Policies can be compared
+offline on recorded prediction streams (PredictionRecorder writes them from
+the app, one JSON object per frame):
+
+    python letter_debounce.py predictions.jsonl
+    python letter_debounce.py predictions.jsonl --policy time --policy frames
+
+If the records carry an "expected" label (hand-annotated), replay() reports
+confirmation latency per expected letter and false triggers.
+"""
+import argparse
+import json
+from collections import namedtuple
+
+IDLE = 'idle'
+LOW = 'low'
+DETECTING = 'detecting'
+CONFIRMED = 'confirmed'
+COOLDOWN = 'cooldown'
+
+DebouncePolicy = namedtuple('DebouncePolicy', [
+    'name', 'time_based', 'required', 'enter_threshold', 'stay_threshold',
+    'weighted', 'max_gap', 'max_missing', 'cooldown', 'max_step',
+])
+
+POLICIES = {
+    # The original rule: 20 consecutive confident frames, 20 frames cooldown.
+    # Frames without a confident hand neither count nor break the run.
+    'frames': DebouncePolicy('frames', time_based=False, required=20, enter_threshold=0.7,
+                             stay_threshold=0.7, weighted=False, max_gap=0,
+                             max_missing=float('inf'), cooldown=20, max_step=1),
+    # ~0.67 s of a 90%-confident sign regardless of frame rate; single-frame
+    # flips to a similar letter do not restart the run
+    'time': DebouncePolicy('time', time_based=True, required=600, enter_threshold=0.7,
+                           stay_threshold=0.55, weighted=True, max_gap=120,
+                           max_missing=300, cooldown=650, max_step=100),
+}
+
+Decision = namedtuple('Decision', ['state', 'label', 'progress', 'text'])
+
+
+class LetterConfirmer:
+    def __init__(self, policy):
+        self.policy = policy
+        self.reset()
+
+    def reset(self):
+        self.candidate = None
+        self.evidence = 0.0     # accumulated frames or ms (confidence-weighted)
+        self.gap = 0.0          # competing-letter observations since the last supporting one
+        self.missing = 0.0      # no / low-confidence observations since the last supporting one
+        self.cooldown = 0.0
+        self.last_time = None
+
+    def _step(self, now):
+        """Units one observation contributes: 1 frame, or ms since the previous one."""
+        p = self.policy
+        if not p.time_based:
+            return 1.0
+        previous, self.last_time = self.last_time, now
+        if previous is None:
+            return 0.0
+        # Clamped so a stall (window drag, voice job) cannot confirm in one step
+        return min((now - previous) * 1000.0, p.max_step)
+
+    def _units(self, value):
+        return f"{value:.0f} ms" if self.policy.time_based else f"{value:.0f} frames"
+
+    def update(self, label, confidence, now):
+        """
+        One observation per frame: the best hand's label and confidence
+        (label None when no hand), now in seconds. Returns a Decision.
+        """
+        p = self.policy
+        step = self._step(now)
+
+        if self.cooldown > 0:
+            self.cooldown -= step
+            if self.cooldown > 0:
+                return Decision(COOLDOWN, label, 0.0, f"Cooldown: {self._units(self.cooldown)}")
+
+        threshold = p.stay_threshold if label == self.candidate else p.enter_threshold
+        if label is None or confidence < threshold:
+            if self.candidate is not None:
+                self.missing += step
+                if self.missing > p.max_missing:
+                    self.candidate = None
+            state = LOW if label is not None else IDLE
+            return Decision(state, label, 0.0, f"Low Confidence: {label}" if label is not None else "")
+
+        if label != self.candidate:
+            if self.candidate is not None and self.gap + step <= p.max_gap:
+                # Tolerated flip: keep the running candidate, count nothing
+                self.gap += step
+                return self._detecting()
+            self.candidate = label
+            self.evidence = 0.0
+
+        self.gap = 0.0
+        self.missing = 0.0
+        self.evidence += step * (confidence if p.weighted else 1.0)
+
+        if self.evidence >= p.required:
+            confirmed = self.candidate
+            self.candidate = None
+            self.evidence = 0.0
+            self.cooldown = p.cooldown
+            return Decision(CONFIRMED, confirmed, 1.0, f"Detected: {confirmed}!")
+        return self._detecting()
+
+    def _detecting(self):
+        p = self.policy
+        return Decision(DETECTING, self.candidate, self.evidence / p.required,
+                        f"Detecting: {self.candidate} ({self.evidence:.0f}/{self._units(p.required)})")
+
+    def describe(self):
+        p = self.policy
+        weighted = " weighted" if p.weighted else ""
+        return f"{self._units(p.required)}{weighted}, {p.enter_threshold * 100:.0f}% confidence"
+
+
+# ============== Recording / replay ==================
+class PredictionRecorder:
+    """Appends one {"t", "label", "confidence"} JSON line per analyzed frame."""
+
+    def __init__(self, path):
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, now, label, confidence):
+        self._file.write(json.dumps({'t': round(now, 4), 'label': label, 'confidence': round(confidence, 4)}) + '\n')
+
+    def close(self):
+        self._file.close()
+
+
+def load_stream(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def replay(policy, records):
+    """
+    Run a policy over recorded frames. Returns a dict with the confirmations,
+    and when records carry "expected" labels: latency per expected segment,
+    misses and false triggers.
+    """
+    confirmer = LetterConfirmer(policy)
+    confirmations = []
+    for record in records:
+        decision = confirmer.update(record.get('label'), record.get('confidence', 0.0), record['t'])
+        if decision.state == CONFIRMED:
+            confirmations.append({'t': record['t'], 'label': decision.label,
+                                  'expected': record.get('expected')})
+
+    result = {'policy': policy.name, 'frames': len(records), 'confirmations': confirmations}
+    if not any('expected' in r for r in records):
+        return result
+
+    # Segments: maximal runs of the same non-empty expected label
+    segments = []
+    for record in records:
+        expected = record.get('expected')
+        if segments and segments[-1]['label'] == expected:
+            segments[-1]['end'] = record['t']
+        elif expected:
+            segments.append({'label': expected, 'start': record['t'], 'end': record['t']})
+        elif segments and segments[-1]['label'] is not None:
+            segments.append({'label': None, 'start': record['t'], 'end': record['t']})
+
+    latencies = []
+    missed = 0
+    for segment in segments:
+        if segment['label'] is None:
+            continue
+        hit = next((c for c in confirmations
+                    if c['label'] == segment['label'] and segment['start'] <= c['t'] <= segment['end']), None)
+        if hit is None:
+            missed += 1
+        else:
+            latencies.append(hit['t'] - segment['start'])
+
+    false_triggers = sum(1 for c in confirmations if c['label'] != c['expected'])
+    result.update({
+        'segments': sum(1 for s in segments if s['label'] is not None),
+        'missed': missed,
+        'false_triggers': false_triggers,
+        'mean_latency_ms': 1000.0 * sum(latencies) / len(latencies) if latencies else None,
+        'max_latency_ms': 1000.0 * max(latencies) if latencies else None,
+    })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded predictions through debounce policies")
+    parser.add_argument('stream', help="JSONL written by PredictionRecorder (optionally with 'expected')")
+    parser.add_argument('--policy', action='append', choices=sorted(POLICIES),
+                        help="Policy to replay (repeatable, default: all)")
+    args = parser.parse_args()
+
+    records = load_stream(args.stream)
+    for name in args.policy or sorted(POLICIES):
+        result = replay(POLICIES[name], records)
+        letters = ''.join(str(c['label']) for c in result['confirmations'])
+        print(f"\n{name:>8}: {len(result['confirmations'])} confirmations over {result['frames']} frames: {letters!r}")
+        if 'segments' in result:
+            mean = result['mean_latency_ms']
+            print(f"{'':>8}  latency mean {mean:.0f} ms, max {result['max_latency_ms']:.0f} ms"
+                  if mean is not None else f"{'':>8}  no expected letter confirmed")
+            print(f"{'':>8}  {result['missed']}/{result['segments']} letters missed, "
+                  f"{result['false_triggers']} false triggers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Per-stage latency recording for HandSignRecognizer.
+
+Every stage keeps its most recent samples in a fixed-size NumPy ring buffer,
+so recording a sample is O(1) with no allocation, and percentiles over the
+rolling window are only computed when somebody asks for them.
+
+    perf = PerfStats()
+    t0 = time.perf_counter()
+    ...
+    perf.add('mediapipe', time.perf_counter() - t0)
+    perf.summary()   # {'mediapipe': {'count', 'mean_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms'}}
+
+The recognizer can draw overlay_text() on the video and dump() the stats to
+JSON / CSV when it exits.
+"""
+import csv
+import json
+import threading
+import time
+
+import numpy as np
+
+PERCENTILES = (50, 90, 99)
+
+
+class RollingWindow:
+    """Fixed-capacity ring buffer of float samples (milliseconds)."""
+
+    def __init__(self, capacity=1024):
+        self.samples = np.zeros(capacity, dtype=np.float64)
+        self.capacity = capacity
+        self.index = 0
+        self.count = 0  # total samples ever added
+
+    def add(self, value):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        self.count += 1
+
+    def values(self):
+        return self.samples[:min(self.count, self.capacity)]
+
+    def stats(self):
+        values = self.values()
+        if len(values) == 0:
+            return None
+        p = np.percentile(values, PERCENTILES)
+        stats = {'count': self.count, 'mean_ms': float(values.mean())}
+        for q, v in zip(PERCENTILES, p):
+            stats[f'p{q}_ms'] = float(v)
+        stats['max_ms'] = float(values.max())
+        return stats
+
+
+class PerfStats:
+    def __init__(self, capacity=1024, enabled=True):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.windows = {}
+        # Guards the stage dict: stages are added from several threads
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        if not self.enabled:
+            return
+        window = self.windows.get(stage)
+        if window is None:
+            with self._lock:
+                window = self.windows.setdefault(stage, RollingWindow(self.capacity))
+        window.add(seconds * 1000.0)
+
+    def timed(self, stage, fn, *args, **kwargs):
+        """Call fn(*args, **kwargs) and record its duration under stage."""
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def summary(self):
+        with self._lock:
+            windows = list(self.windows.items())
+        return {stage: w.stats() for stage, w in windows if w.count}
+
+    def reset(self):
+        with self._lock:
+            self.windows = {}
+
+    # ============== Reporting ==================
+    def mean_ms(self, stage):
+        window = self.windows.get(stage)
+        if window is None or window.count == 0:
+            return None
+        return float(window.values().mean())
+
+    def fps(self, stage='loop'):
+        """Frames per second from the mean duration of a per-frame stage."""
+        ms = self.mean_ms(stage)
+        return 1000.0 / ms if ms else 0.0
+
+    def overlay_text(self, stages):
+        """Compact 'FPS 28.4 | mediapipe 18.2 | classifier 0.1 ms' line for the video overlay."""
+        parts = [f"FPS {self.fps():.1f}"]
+        for stage in stages:
+            ms = self.mean_ms(stage)
+            if ms is not None:
+                parts.append(f"{stage} {ms:.1f}")
+        return " | ".join(parts) + " ms"
+
+    def dump(self, path):
+        """Write summary() to path as JSON, or as CSV if path ends in .csv."""
+        summary = self.summary()
+        if path.lower().endswith('.csv'):
+            columns = ['count', 'mean_ms'] + [f'p{q}_ms' for q in PERCENTILES] + ['max_ms']
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['stage'] + columns)
+                for stage, stats in summary.items():
+                    writer.writerow([stage] + [f"{stats[c]:.4f}" if c != 'count' else stats[c] for c in columns])
+        else:
+            with open(path, 'w') as f:
+                json.dump({'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'stages': summary}, f, indent=2)
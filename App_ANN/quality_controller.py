@@ -0,0 +1,113 @@
+"""
+Adaptive MediaPipe quality for slow machines.
+
+The recognizer used to run full-resolution MediaPipe on every frame no
+matter how long that took, so on weak kiosks the loop fell far behind and
+the 20-frame debounce took seconds. QualityController watches how long each
+frame's analysis takes and how often frames arrive, and walks a ladder of
+cheaper settings when the target FPS is missed:
+
+    level  input scale  MediaPipe on  model_complexity
+      0       1.00      every frame          1
+      1       0.75      every frame          1
+      2       0.50      every frame          1
+      3       0.50      every 2nd frame      1
+      4       0.50      every 2nd frame      0
+
+Frames skipped by a level reuse the last landmarks. Only frames that actually
+ran MediaPipe count towards the analysis time: averaging in the cheap skipped
+frames would make a skipping level look fast enough to step back up, and the
+controller would then bounce between two levels. It steps back up when the
+analysis time leaves enough headroom again. After each change the decision is
+held for hold_seconds, so the new cost can be measured before the next step.
+"""
+import time
+from collections import deque, namedtuple
+
+QualityLevel = namedtuple('QualityLevel', ['scale', 'skip', 'model_complexity'])
+
+DEFAULT_LADDER = (
+    QualityLevel(1.0, 1, 1),
+    QualityLevel(0.75, 1, 1),
+    QualityLevel(0.5, 1, 1),
+    QualityLevel(0.5, 2, 1),
+    QualityLevel(0.5, 2, 0),
+)
+
+
+class QualityController:
+    def __init__(self, target_fps=20.0, ladder=DEFAULT_LADDER, window=30, hold_seconds=2.0,
+                 down_ratio=0.9, up_ratio=0.5):
+        """
+        window:     frames averaged before a decision
+        down_ratio: step down when FPS < target * down_ratio and the analysis
+                    alone uses more than down_ratio of the frame budget
+        up_ratio:   step up when the analysis uses less than up_ratio of the budget
+        """
+        self.target_fps = target_fps
+        self.ladder = ladder
+        self.hold_seconds = hold_seconds
+        self.down_ratio = down_ratio
+        self.up_ratio = up_ratio
+
+        self.index = 0
+        self._work = deque(maxlen=window)
+        self._intervals = deque(maxlen=window)
+        self._frame = 0
+        self._processed = True   # whether the current frame runs MediaPipe
+        self._changed_at = time.perf_counter()
+        self.fps = 0.0
+        self.changes = 0
+
+    @property
+    def level(self):
+        return self.ladder[self.index]
+
+    def should_process(self):
+        """Call once per frame: False when this frame should reuse the last landmarks."""
+        self._frame += 1
+        self._processed = self._frame % self.level.skip == 0
+        return self._processed
+
+    def update(self, work_seconds, interval_seconds):
+        """
+        Record one frame: work_seconds spent analyzing it, interval_seconds
+        since the previous frame started. Returns True if the level changed.
+        Skipped frames only count towards the frame rate.
+        """
+        if self._processed:
+            self._work.append(work_seconds)
+        if interval_seconds > 0:
+            self._intervals.append(interval_seconds)
+        if len(self._work) < self._work.maxlen or not self._intervals:
+            return False
+
+        self.fps = len(self._intervals) / sum(self._intervals)
+        now = time.perf_counter()
+        if now - self._changed_at < self.hold_seconds:
+            return False
+
+        budget = 1.0 / self.target_fps
+        work = sum(self._work) / len(self._work)
+        if (self.fps < self.target_fps * self.down_ratio and work > budget * self.down_ratio
+                and self.index < len(self.ladder) - 1):
+            return self._set(self.index + 1, now)
+        if work < budget * self.up_ratio and self.index > 0:
+            return self._set(self.index - 1, now)
+        return False
+
+    def _set(self, index, now):
+        direction = "down" if index > self.index else "up"
+        self.index = index
+        self._changed_at = now
+        self._work.clear()
+        self._intervals.clear()
+        self.changes += 1
+        print(f"⚙️ Quality {direction} -> {self.status_text()}")
+        return True
+
+    def status_text(self):
+        level = self.level
+        every = "every frame" if level.skip == 1 else f"every {level.skip} frames"
+        return (f"Quality {self.index}/{len(self.ladder) - 1}: input x{level.scale:.2f}, "
+                f"MediaPipe {every}, complexity {level.model_complexity} | {self.fps:.1f} FPS")
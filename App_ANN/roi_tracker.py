@@ -0,0 +1,135 @@
+"""
+Region-of-interest hand tracking for MediaPipe.
+
+The recognizer feeds the whole padded 1280x1280 square to Hands.process()
+every frame, although the previous frame's landmarks already say where the
+hands are. Once hands are locked, RoiTracker instead
+
+  1. takes the box around the last landmarks (all hands), expanded by
+     `expand` and made square
+  2. crops it from the frame and scales it to a fixed size x size RGB image
+     in one cv2.warpAffine (parts outside the frame stay black)
+  3. runs a separate Hands instance on that small image
+  4. maps the landmarks back to the normalized coordinates of the padded
+     square, so features, boxes and drawing are unchanged downstream
+
+If the crop finds no hand, the same frame is searched full-frame and the
+lock is dropped; every `refresh_every` frames a full-frame search runs
+anyway so a second hand entering the picture is picked up.
+
+`python benchmark.py --compare-roi` measures latency and label agreement
+against the full-frame path.
+"""
+import cv2
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+from hand_features import stack_points
+
+FULL = 'full'
+ROI = 'roi'
+LOST = 'lost'
+
+
+class RoiTracker:
+    def __init__(self, hands, size=256, expand=1.6, min_fraction=0.2, refresh_every=30, perf=None):
+        """
+        hands:         MediaPipe Hands instance used only for the crops
+        size:          side of the square image given to MediaPipe (px)
+        expand:        crop side = largest side of the landmark box * expand
+        min_fraction:  smallest crop, as a fraction of the padded square
+        refresh_every: frames between forced full-frame searches
+        perf:          optional PerfStats receiving 'roi_crop' / 'mediapipe'
+        """
+        self.hands = hands
+        self.size = size
+        self.expand = expand
+        self.min_fraction = min_fraction
+        self.refresh_every = refresh_every
+        self.perf = perf
+
+        self._input = np.zeros((size, size, 3), dtype=np.uint8)
+        self.box = None            # (x0, y0, crop_side) in frame pixels
+        self.since_full = 0
+        self.mode = FULL
+        self.counts = {FULL: 0, ROI: 0, LOST: 0}
+
+    def reset(self):
+        self.box = None
+
+    # ============== Box ==================
+    def _box_from_points(self, points, side):
+        """Square crop (x0, y0, crop_side) around (n, 21, 2) square-normalized points."""
+        mins = points.reshape(-1, 2).min(axis=0) * side
+        maxs = points.reshape(-1, 2).max(axis=0) * side
+        center = (mins + maxs) / 2.0
+        crop = max(float((maxs - mins).max()) * self.expand, self.min_fraction * side)
+        if crop >= side:
+            return None  # hands fill the frame, the crop would not be smaller
+        x0, y0 = (center - crop / 2.0).astype(int)
+        return int(x0), int(y0), int(np.ceil(crop))
+
+    # ============== Crop / map back ==================
+    def _crop(self, frame, box):
+        x0, y0, crop = box
+        scale = self.size / crop
+        matrix = np.float32([[scale, 0, -x0 * scale], [0, scale, -y0 * scale]])
+        cv2.warpAffine(frame, matrix, (self.size, self.size), dst=self._input,
+                       flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT, borderValue=0)
+        cv2.cvtColor(self._input, cv2.COLOR_BGR2RGB, dst=self._input)
+        return self._input
+
+    @staticmethod
+    def _map_back(multi_hand_landmarks, box, side):
+        """Crop-normalized landmarks -> landmarks normalized to the padded square."""
+        x0, y0, crop = box
+        ratio = crop / side
+        mapped = []
+        for hand_landmarks in multi_hand_landmarks:
+            mapped.append(landmark_pb2.NormalizedLandmarkList(landmark=[
+                landmark_pb2.NormalizedLandmark(
+                    x=(x0 + lm.x * crop) / side,
+                    y=(y0 + lm.y * crop) / side,
+                    z=lm.z * ratio,
+                )
+                for lm in hand_landmarks.landmark
+            ]))
+        return mapped
+
+    # ============== Tracking ==================
+    def process(self, frame, side, full_search):
+        """
+        Hand landmarks for frame (or None), normalized to the side x side square.
+        full_search(frame) must return the full-frame multi_hand_landmarks.
+        """
+        landmarks = None
+        mode = FULL
+
+        if self.box is not None and self.since_full < self.refresh_every:
+            crop = self._timed('roi_crop', self._crop, frame, self.box)
+            results = self._timed('mediapipe', self.hands.process, crop)
+            if results and results.multi_hand_landmarks:
+                landmarks = self._map_back(results.multi_hand_landmarks, self.box, side)
+                mode = ROI
+            else:
+                mode = LOST
+
+        if landmarks is None:
+            landmarks = full_search(frame)
+            self.since_full = 0
+        else:
+            self.since_full += 1
+
+        self.box = self._box_from_points(stack_points(landmarks), side) if landmarks else None
+        self.mode = mode
+        self.counts[mode] += 1
+        return landmarks
+
+    def _timed(self, stage, fn, *args):
+        if self.perf is None:
+            return fn(*args)
+        return self.perf.timed(stage, fn, *args)
+
+    def status_text(self):
+        total = sum(self.counts.values()) or 1
+        return f"ROI {self.mode} ({self.counts[ROI] * 100 // total}% cropped, {self.counts[LOST]} lost)"
@@ -0,0 +1,427 @@
+"""
+Temporal classifier over windows of landmark frames, for signs that move (J, Z).
+
+The MLP in train_classifier.py sees one 42-float frame at a time, so a sign
+is only defined by its final hand shape. Here a sign is a window of WINDOW
+consecutive frames of one hand; each frame contributes SEQ_FEATURE_DIM floats:
+
+    the 42 min-shifted shape features (hand_features.points_to_features)
+    + the wrist displacement (dx, dy) since the previous frame
+
+Model: Conv1D(k=3) -> Conv1D(k=3) -> global average pool -> softmax, both
+convolutions 'valid' with ReLU. It is trained with Keras and exported to a
+small .npz that SequenceClassifier runs with NumPy only.
+
+Because the convolutions are causal over the window, a SequenceStream per
+hand only needs the last k inputs of each layer and a ring of the last P
+conv outputs (with their running sum) for the pooling. Each new frame costs
+one conv step per layer plus the dense layer, instead of re-running the
+whole window; after WINDOW frames its output equals forward_window() on the
+last WINDOW frames.
+
+    python sequence_model.py record J          # clips/J/<n>.mp4 from the camera
+    python sequence_model.py build             # clips/<label>/*.mp4 -> sequence_store/
+    python sequence_model.py train             # -> sequence_model.h5 + sequence_model.npz
+
+app.py uses sequence_model.npz when it exists (SEQUENCE_MODEL_PATH). Clips are
+stored as the camera delivers them and mirrored while decoding, like the app
+mirrors its camera frames, and the app feeds the streams raw (unsmoothed)
+landmarks, so motion and hand shape look the same in training and serving.
+WINDOW counts frames, not seconds: at the camera's 30 fps a window is about
+half a second, and proportionally longer when the app processes fewer frames.
+"""
+import argparse
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from feature_store import save_dataset, load_store
+from hand_features import FEATURE_DIM, stack_points, points_to_features
+
+CLIPS_DIR = './clips'
+SEQUENCE_STORE_PATH = 'sequence_store'
+SEQUENCE_KERAS_PATH = 'sequence_model.h5'
+SEQUENCE_MODEL_PATH = 'sequence_model.npz'
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+WINDOW = 16
+STRIDE = 2
+SEQ_FEATURE_DIM = FEATURE_DIM + 2
+
+# Bump when the per-frame features change; stored in the store and the export
+SEQ_FEATURE_VERSION = "xy-minus-min+wrist-delta-mirrored-v2"
+SEQ_EXPORT_VERSION = 1
+
+
+# ============== Features ==================
+def frame_features(points, prev_points=None):
+    """(21, 2) square-normalized points -> (SEQ_FEATURE_DIM,) shape features + wrist delta."""
+    row = np.empty(SEQ_FEATURE_DIM, dtype=np.float32)
+    row[:FEATURE_DIM] = points_to_features(points)[0]
+    row[FEATURE_DIM:] = points[0] - prev_points[0] if prev_points is not None else 0.0
+    return row
+
+
+def sequence_windows(point_frames, window=WINDOW, stride=STRIDE):
+    """
+    point_frames: per video frame, (21, 2) points or None when no hand.
+    Returns (n, window, SEQ_FEATURE_DIM) windows taken from runs of
+    consecutive frames with a hand; a missing hand ends the run.
+    """
+    runs, run, prev = [], [], None
+    for points in list(point_frames) + [None]:
+        if points is None:
+            if len(run) >= window:
+                runs.append(np.stack(run))
+            run, prev = [], None
+            continue
+        run.append(frame_features(points, prev))
+        prev = points
+
+    windows = [run[start:start + window]
+               for run in runs
+               for start in range(0, len(run) - window + 1, stride)]
+    if not windows:
+        return np.empty((0, window, SEQ_FEATURE_DIM), dtype=np.float32)
+    return np.stack(windows)
+
+
+# ============== Dataset builder ==================
+def list_clips(clips_dir=CLIPS_DIR):
+    """Sorted list of (clip_path, label) for every video under clips_dir/<label>/."""
+    items = []
+    for label in sorted(os.listdir(clips_dir)):
+        class_dir = os.path.join(clips_dir, label)
+        if not os.path.isdir(class_dir):
+            continue
+        for name in sorted(os.listdir(class_dir)):
+            if name.lower().endswith(VIDEO_EXTENSIONS):
+                items.append((os.path.join(class_dir, name), label))
+    return items
+
+
+def clip_points(path, hands, flip=True):
+    """
+    Per-frame (21, 2) points of the first hand (None when no hand), normalized
+    like app.py. flip mirrors each frame first, as app.py does with the camera.
+    """
+    cap = cv2.VideoCapture(path)
+    square = None
+    frames = []
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        if flip:
+            frame = cv2.flip(frame, 1)
+        H, W = frame.shape[:2]
+        side = max(H, W)
+        if square is None or square.shape[0] != side:
+            square = np.zeros((side, side, 3), dtype=np.uint8)
+        square[:H, :W] = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        results = hands.process(square)
+        if results.multi_hand_landmarks:
+            frames.append(stack_points(results.multi_hand_landmarks[0])[0])
+        else:
+            frames.append(None)
+    cap.release()
+    return frames
+
+
+def build_sequence_dataset(clips_dir=CLIPS_DIR, window=WINDOW, stride=STRIDE, flip=True):
+    """Run MediaPipe (video mode) over every clip. Returns (windows, labels)."""
+    import mediapipe as mp
+
+    all_windows, labels = [], []
+    for path, label in list_clips(clips_dir):
+        # Fresh tracker per clip, so no landmark state leaks between clips
+        with mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=1,
+                                      min_detection_confidence=0.5) as hands:
+            windows = sequence_windows(clip_points(path, hands, flip), window, stride)
+        print(f"  {path}: {len(windows)} windows")
+        all_windows.append(windows)
+        labels.extend([label] * len(windows))
+
+    if not all_windows:
+        return np.empty((0, window, SEQ_FEATURE_DIM), dtype=np.float32), labels
+    return np.concatenate(all_windows), labels
+
+
+def record_clips(label, clips_dir=CLIPS_DIR, count=10, seconds=2.0, camera=0):
+    """
+    Record `count` clips of one sign from the camera into clips_dir/label/.
+    The preview is mirrored like the app; the clips keep the raw frames
+    (like collect_imgs.py) and are mirrored by clip_points().
+    """
+    class_dir = os.path.join(clips_dir, label)
+    os.makedirs(class_dir, exist_ok=True)
+    start_index = len(os.listdir(class_dir))
+
+    cap = cv2.VideoCapture(camera)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    try:
+        for i in range(start_index, start_index + count):
+            # Wait for 'Q' like collect_imgs.py, then record one clip
+            while True:
+                ok, frame = cap.read()
+                if not ok:
+                    return
+                preview = cv2.flip(frame, 1)
+                cv2.putText(preview, f'{label} clip {i}: press "Q" to record', (50, 50),
+                            cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 0), 2, cv2.LINE_AA)
+                cv2.imshow('record', preview)
+                if cv2.waitKey(25) == ord('q'):
+                    break
+
+            path = os.path.join(class_dir, f'{i}.mp4')
+            h, w = frame.shape[:2]
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (w, h))
+            end = time.perf_counter() + seconds
+            while time.perf_counter() < end:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                writer.write(frame)
+                cv2.imshow('record', cv2.flip(frame, 1))
+                cv2.waitKey(1)
+            writer.release()
+            print(f"🎥 {path}")
+    finally:
+        cap.release()
+        cv2.destroyAllWindows()
+
+
+# ============== Training / export ==================
+def create_sequence_model(num_classes, window=WINDOW, feature_dim=SEQ_FEATURE_DIM, filters=64, kernel=3):
+    from tensorflow.keras import layers, models
+
+    model = models.Sequential([
+        layers.Input(shape=(window, feature_dim)),
+        layers.Conv1D(filters, kernel, padding='valid', activation='relu'),
+        layers.Conv1D(filters, kernel, padding='valid', activation='relu'),
+        layers.GlobalAveragePooling1D(),
+        layers.Dropout(0.3),
+        layers.Dense(num_classes, activation='softmax'),
+    ])
+    model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+    return model
+
+
+def export_sequence_model(model, classes, path=SEQUENCE_MODEL_PATH, window=WINDOW):
+    """Write the conv / dense weights and classes to a NumPy-only .npz. Returns the manifest."""
+    convs = [layer.get_weights() for layer in model.layers if layer.__class__.__name__ == 'Conv1D']
+    dense = [layer.get_weights() for layer in model.layers if layer.__class__.__name__ == 'Dense']
+    if len(dense) != 1:
+        raise ValueError("Expected Conv1D layers followed by a single Dense layer")
+
+    arrays = {}
+    for i, (kernel, bias) in enumerate(convs):
+        arrays[f'conv_kernel_{i}'] = kernel   # (k, in, out)
+        arrays[f'conv_bias_{i}'] = bias
+    arrays['dense_kernel'], arrays['dense_bias'] = dense[0]
+    arrays['classes'] = np.asarray([str(c) for c in classes])
+
+    manifest = {
+        'format_version': SEQ_EXPORT_VERSION,
+        'feature_version': SEQ_FEATURE_VERSION,
+        'window': window,
+        'feature_dim': int(convs[0][0].shape[1]),
+        'conv_layers': len(convs),
+        'classes': [str(c) for c in classes],
+    }
+    arrays['manifest'] = np.asarray(json.dumps(manifest))
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+    return manifest
+
+
+def train(store_path=SEQUENCE_STORE_PATH, keras_path=SEQUENCE_KERAS_PATH, output=SEQUENCE_MODEL_PATH,
+          epochs=60, batch_size=32):
+    from sklearn.model_selection import train_test_split
+
+    windows, labels, manifest = load_store(store_path, mmap=False, feature_version=SEQ_FEATURE_VERSION)
+    classes = manifest['classes']
+    window = manifest['feature_shape'][0]
+    print(f"📦 {len(windows)} windows of {window} frames, {len(classes)} classes: {classes}")
+
+    x_train, x_test, y_train, y_test = train_test_split(
+        windows, labels, test_size=0.2, shuffle=True, stratify=labels)
+
+    model = create_sequence_model(len(classes), window=window)
+    model.summary()
+    model.fit(x_train, y_train, epochs=epochs, batch_size=batch_size,
+              validation_data=(x_test, y_test), verbose=1)
+    test_loss, test_acc = model.evaluate(x_test, y_test, verbose=0)
+    print(f"Test Accuracy: {test_acc * 100:.2f}%")
+
+    model.save(keras_path)
+    export_sequence_model(model, classes, output, window)
+
+    # The exported windowed and streaming paths must both match Keras
+    exported = SequenceClassifier.from_npz(output)
+    reference = model.predict(x_test, verbose=0)
+    batch_err = float(np.max(np.abs(exported.forward_window(x_test) - reference))) if len(x_test) else 0.0
+    stream_err = 0.0
+    for sample, expected in zip(x_test[:20], reference[:20]):
+        stream = exported.stream()
+        for row in sample:
+            probs = stream.push(row)
+        stream_err = max(stream_err, float(np.max(np.abs(probs - expected))))
+    print(f"✅ Wrote {keras_path} and {output} | max probability error: "
+          f"window {batch_err:.2e}, streaming {stream_err:.2e}")
+
+
+# ============== NumPy inference ==================
+def _softmax(x):
+    x = x - x.max(axis=-1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=-1, keepdims=True)
+    return x
+
+
+class SequenceClassifier:
+    """Exported sequence model: batched forward_window() and per-hand stream()."""
+
+    def __init__(self, convs, dense, classes, window):
+        self.convs = convs      # [(kernel (k, in, out), bias)]
+        self.dense = dense      # (kernel, bias)
+        self.classes_ = np.asarray(classes)
+        self.window = window
+        # Conv outputs left for the pooling after all 'valid' convolutions
+        self.pool_length = window - sum(kernel.shape[0] - 1 for kernel, _ in convs)
+
+    @classmethod
+    def from_npz(cls, path=SEQUENCE_MODEL_PATH):
+        with np.load(path, allow_pickle=False) as npz:
+            manifest = json.loads(str(npz['manifest']))
+            if manifest.get('format_version') != SEQ_EXPORT_VERSION:
+                raise ValueError(f"{path}: unsupported export format {manifest.get('format_version')}")
+            if manifest.get('feature_version') != SEQ_FEATURE_VERSION:
+                raise ValueError(f"{path} was trained on '{manifest.get('feature_version')}' features")
+            convs = [(npz[f'conv_kernel_{i}'].astype(np.float32), npz[f'conv_bias_{i}'].astype(np.float32))
+                     for i in range(manifest['conv_layers'])]
+            dense = (npz['dense_kernel'].astype(np.float32), npz['dense_bias'].astype(np.float32))
+            classes = npz['classes']
+        return cls(convs, dense, classes, manifest['window'])
+
+    def forward_window(self, windows):
+        """(n, window, feature_dim) -> (n, num_classes) probabilities, whole windows at once."""
+        x = np.asarray(windows, dtype=np.float32)
+        for kernel, bias in self.convs:
+            k = kernel.shape[0]
+            steps = x.shape[1] - k + 1
+            y = x[:, 0:steps] @ kernel[0]
+            for j in range(1, k):
+                y += x[:, j:j + steps] @ kernel[j]
+            y += bias
+            x = np.maximum(y, 0.0, out=y)
+        logits = x.mean(axis=1) @ self.dense[0] + self.dense[1]
+        return _softmax(logits)
+
+    def stream(self):
+        return SequenceStream(self)
+
+
+class SequenceStream:
+    """Incremental state of the sequence model for one tracked hand."""
+
+    def __init__(self, model):
+        self.model = model
+        self._inputs = [np.zeros((kernel.shape[0], kernel.shape[1]), dtype=np.float32)
+                        for kernel, _ in model.convs]
+        self._pool = np.zeros((model.pool_length, model.convs[-1][0].shape[2]), dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        self._counts = [0] * len(self._inputs)
+        self._pool_count = 0
+        self._pool_sum = np.zeros(self._pool.shape[1], dtype=np.float64)
+        self.prev_points = None
+
+    @property
+    def ready(self):
+        return self._pool_count >= len(self._pool)
+
+    def push_points(self, points):
+        """Add one frame of (21, 2) points. Returns class probabilities once WINDOW frames are in, else None."""
+        row = frame_features(points, self.prev_points)
+        self.prev_points = points.copy()
+        return self.push(row)
+
+    def push(self, row):
+        x = np.asarray(row, dtype=np.float32)
+        for layer, (kernel, bias) in enumerate(self.model.convs):
+            ring = self._inputs[layer]
+            k = len(ring)
+            count = self._counts[layer]
+            ring[count % k] = x
+            count += 1
+            self._counts[layer] = count
+            if count < k:
+                return None
+            # Oldest to newest input, matching kernel[0] .. kernel[k-1]
+            y = bias.copy()
+            for j in range(k):
+                y += ring[(count - k + j) % k] @ kernel[j]
+            x = np.maximum(y, 0.0, out=y)
+
+        length = len(self._pool)
+        slot = self._pool_count % length
+        if self._pool_count >= length:
+            self._pool_sum -= self._pool[slot]
+        self._pool[slot] = x
+        self._pool_sum += x
+        self._pool_count += 1
+        if slot == length - 1:
+            # Re-sum once per lap so the running sum cannot drift
+            self._pool_sum = self._pool.sum(axis=0, dtype=np.float64)
+        if self._pool_count < length:
+            return None
+
+        pooled = (self._pool_sum / length).astype(np.float32)
+        logits = pooled @ self.model.dense[0] + self.model.dense[1]
+        return _softmax(logits[None])[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequence model for moving signs (J, Z)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    record = sub.add_parser('record', help="Record clips of one sign from the camera")
+    record.add_argument('label')
+    record.add_argument('--clips-dir', default=CLIPS_DIR)
+    record.add_argument('--count', type=int, default=10)
+    record.add_argument('--seconds', type=float, default=2.0)
+    record.add_argument('--camera', type=int, default=0)
+
+    build = sub.add_parser('build', help="Clips -> fixed-length landmark windows (feature store)")
+    build.add_argument('--clips-dir', default=CLIPS_DIR)
+    build.add_argument('--output', default=SEQUENCE_STORE_PATH)
+    build.add_argument('--window', type=int, default=WINDOW)
+    build.add_argument('--stride', type=int, default=STRIDE)
+    build.add_argument('--no-flip', dest='flip', action='store_false',
+                       help="Clips are already mirrored like the app's view")
+
+    fit = sub.add_parser('train', help="Train on the window store and export the .npz")
+    fit.add_argument('--store', default=SEQUENCE_STORE_PATH)
+    fit.add_argument('--output', default=SEQUENCE_MODEL_PATH)
+    fit.add_argument('--epochs', type=int, default=60)
+    fit.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record_clips(args.label, args.clips_dir, args.count, args.seconds, args.camera)
+    elif args.command == 'build':
+        windows, labels = build_sequence_dataset(args.clips_dir, args.window, args.stride, args.flip)
+        manifest = save_dataset(args.output, windows, labels, feature_version=SEQ_FEATURE_VERSION,
+                                extra={'window': args.window, 'stride': args.stride, 'flip': args.flip})
+        print(f"✅ {manifest['num_samples']} windows, {len(manifest['classes'])} classes in {args.output}")
+    else:
+        train(args.store, output=args.output, epochs=args.epochs, batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Serial link to the ESP32 owned by a dedicated reader thread.
+
+The render loop used to poll the port every frame (readline() with a 10 ms
+timeout) and servo commands were written from whichever thread called
+send_servo_command(). SerialTransport instead:
+
+  - opens the port on its own thread and re-opens it if it drops (COM7
+    unplugged, ESP32 reset), without blocking the app
+  - frames the incoming byte stream into lines and parses each line into a
+    typed SerialEvent: button presses (BTN1–BTN4), servo sequence status
+    (see servo_protocol.py) and plain firmware log lines
+  - delivers events through a thread-safe queue (get_events()) and passes
+    every line to an optional on_line callback straight from the reader
+    thread (used for servo acknowledgements, which must not wait for the
+    next frame)
+  - serializes outgoing commands with a lock
+
+LoopbackPort and open_pty_pair() let it run without hardware on Linux.
+"""
+import os
+import queue
+import re
+import threading
+import time
+from collections import namedtuple
+
+from servo_protocol import parse_status_line
+
+try:
+    import serial
+except ImportError:
+    serial = None
+
+# kind: 'button' (value 1–4), 'sequence' (value (status, letter)), 'log' (value None),
+#       'connected' / 'disconnected' (value port name)
+SerialEvent = namedtuple('SerialEvent', ['kind', 'value', 'line', 'time'])
+
+BUTTON_RE = re.compile(r'^BTN([1-4])\b')
+
+
+def parse_line(line):
+    """Turn one line from the ESP32 into a SerialEvent."""
+    now = time.time()
+    m = BUTTON_RE.match(line)
+    if m:
+        return SerialEvent('button', int(m.group(1)), line, now)
+    status = parse_status_line(line)
+    if status is not None:
+        return SerialEvent('sequence', status, line, now)
+    return SerialEvent('log', None, line, now)
+
+
+def open_serial_port(port, baud, timeout):
+    if serial is None:
+        raise OSError("pyserial is not installed")
+    return serial.Serial(port, baud, timeout=timeout)
+
+
+class SerialTransport:
+    def __init__(self, port, baud, open_port=open_serial_port, on_line=None,
+                 read_timeout=0.1, reconnect_delay=1.0, boot_delay=2.0, max_events=256):
+        """
+        open_port:  callable(port, baud, timeout) -> pyserial-like object
+                    (read, write, flush, close, in_waiting)
+        on_line:    optional callable(line) run on the reader thread for every line
+        boot_delay: wait after opening, the ESP32 resets when the port opens
+        """
+        self.port = port
+        self.baud = baud
+        self.open_port = open_port
+        self.on_line = on_line
+        self.read_timeout = read_timeout
+        self.reconnect_delay = reconnect_delay
+        self.boot_delay = boot_delay
+
+        self.events = queue.Queue(maxsize=max_events)
+        self._conn = None
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.connected = False
+        self.reconnects = 0
+
+    # ============== Lifecycle ==================
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="serial", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self._close()
+
+    # ============== Outgoing ==================
+    def write(self, command):
+        """Send one command line. Returns False if the port is not connected."""
+        with self._write_lock:
+            conn = self._conn
+            if conn is None or not self.connected:
+                return False
+            try:
+                conn.write((command + "\n").encode('utf-8'))
+                conn.flush()
+                return True
+            except (OSError, ValueError) as e:
+                # ValueError: pyserial raises it for writes on a port closed under us
+                print("Serial write error:", e)
+                return False
+
+    # ============== Incoming ==================
+    def get_events(self):
+        """All events received since the last call (never blocks)."""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _emit(self, event):
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            # Nobody is draining (e.g. app busy); keep the newest events
+            try:
+                self.events.get_nowait()
+            except queue.Empty:
+                pass
+            self.events.put_nowait(event)
+
+    # ============== Reader thread ==================
+    def _open(self):
+        try:
+            conn = self.open_port(self.port, self.baud, self.read_timeout)
+        except (OSError, ValueError) as e:
+            return e
+        if self.boot_delay and self._stop.wait(self.boot_delay):
+            conn.close()
+            return None
+        with self._write_lock:
+            self._conn = conn
+            self.connected = True
+        print(f"✅ Serial connected on {self.port}.")
+        self._emit(SerialEvent('connected', self.port, '', time.time()))
+        return None
+
+    def _close(self):
+        with self._write_lock:
+            conn, self._conn = self._conn, None
+            was_connected, self.connected = self.connected, False
+        if conn is not None:
+            try:
+                conn.close()
+            except (OSError, ValueError):
+                pass
+        return was_connected
+
+    def _run(self):
+        buffer = b""
+        last_error = None
+        while not self._stop.is_set():
+            if self._conn is None:
+                error = self._open()
+                if self._conn is None:
+                    if error is not None and str(error) != str(last_error):
+                        print(f"⚠️ Could not open serial port {self.port}: {error} (retrying)")
+                        last_error = error
+                    self._stop.wait(self.reconnect_delay)
+                    continue
+                last_error = None
+                buffer = b""
+
+            try:
+                # Blocks for at most read_timeout when nothing arrives
+                chunk = self._conn.read(max(1, self._conn.in_waiting))
+            except (OSError, ValueError) as e:
+                print("Serial read error:", e)
+                if self._close():
+                    self.reconnects += 1
+                    self._emit(SerialEvent('disconnected', self.port, '', time.time()))
+                continue
+
+            if not chunk:
+                continue
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for raw in lines:
+                line = raw.decode(errors='ignore').strip()
+                if not line:
+                    continue
+                if self.on_line is not None:
+                    self.on_line(line)
+                self._emit(parse_line(line))
+
+
+# ============== Stand-ins ==================
+class LoopbackPort:
+    """
+    In-memory pyserial stand-in. inject() queues bytes as if sent by the
+    ESP32; everything the host writes is kept in written and optionally
+    answered by responder(command) -> list of reply lines.
+    """
+
+    def __init__(self, timeout=0.1, responder=None):
+        self.timeout = timeout
+        self.responder = responder
+        self.written = []
+        self._rx = bytearray()
+        self._cond = threading.Condition()
+        self.closed = False
+
+    def inject(self, line):
+        with self._cond:
+            self._rx += (line + "\n").encode('utf-8')
+            self._cond.notify_all()
+
+    @property
+    def in_waiting(self):
+        return len(self._rx)
+
+    def read(self, size=1):
+        with self._cond:
+            if self.closed:
+                raise OSError("port closed")
+            self._cond.wait_for(lambda: self._rx or self.closed, self.timeout)
+            data = bytes(self._rx[:size])
+            del self._rx[:size]
+            return data
+
+    def write(self, data):
+        if self.closed:
+            raise OSError("port closed")
+        command = data.decode('utf-8').strip()
+        self.written.append(command)
+        if self.responder is not None:
+            for reply in self.responder(command):
+                self.inject(reply)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+def open_pty_pair():
+    """
+    Linux/macOS: create a pseudo-terminal pair. Returns (master_fd, slave_path);
+    open slave_path with SerialTransport and read/write master_fd to play the ESP32.
+    """
+    master_fd, slave_fd = os.openpty()
+    return master_fd, os.ttyname(slave_fd)
@@ -0,0 +1,177 @@
+"""
+Acknowledgement-driven servo sequencing for the ESP32 (esp32/Servo_Driver.ino).
+
+The firmware already reports every letter it plays on the serial port:
+
+    Running sequence A...
+    Sequence A done.
+
+ServoSequencer sends a letter, then waits for the matching "done" line
+instead of sleeping a fixed LETTER_INTERVAL_SEC. Each wait has a per-letter
+timeout derived from how long that letter took before (learned durations are
+kept in servo_timings.json); letters never seen fall back to the old fixed
+interval, so firmware without the status lines still works.
+
+Serial lines reach the sequencer through feed_line(), called by whoever
+reads the port.
+"""
+import json
+import os
+import re
+import threading
+import time
+
+SERVO_TIMINGS_PATH = 'servo_timings.json'
+
+SEQUENCE_START_RE = re.compile(r'^Running sequence ([A-Za-z])\b', re.IGNORECASE)
+SEQUENCE_DONE_RE = re.compile(r'^Sequence ([A-Za-z]) done', re.IGNORECASE)
+RELEASE_DONE_PREFIX = 'Release / home position set'
+UNKNOWN_COMMAND_PREFIX = 'Unknown command:'
+
+
+def parse_status_line(line):
+    """
+    Classify a firmware status line.
+    Returns ('start', letter), ('done', letter), ('release', None),
+    ('unknown', command) or None for anything else.
+    """
+    m = SEQUENCE_DONE_RE.match(line)
+    if m:
+        return 'done', m.group(1).upper()
+    m = SEQUENCE_START_RE.match(line)
+    if m:
+        return 'start', m.group(1).upper()
+    if line.startswith(RELEASE_DONE_PREFIX):
+        return 'release', None
+    if line.startswith(UNKNOWN_COMMAND_PREFIX):
+        return 'unknown', line[len(UNKNOWN_COMMAND_PREFIX):].strip().upper()
+    return None
+
+
+class ServoSequencer:
+    def __init__(self, send, default_timeout=8.0, min_timeout=2.0, margin=1.5,
+                 alpha=0.3, timings_path=SERVO_TIMINGS_PATH):
+        """
+        send:            callable(command) writing one line to the ESP32,
+                         returns False when it could not be written
+        default_timeout: wait for letters without a learned duration (s)
+        margin:          timeout = learned duration * margin + 1 s
+        alpha:           weight of the newest measurement in the learned average
+        """
+        self.send = send
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.margin = margin
+        self.alpha = alpha
+        self.timings_path = timings_path
+
+        self._cond = threading.Condition()
+        self._waiting_for = None
+        self._started_at = None
+        self._result = None  # 'done' / 'unknown' once the firmware answered
+
+        self.durations = self._load_durations()
+        self.timeouts = 0
+
+    # ============== Learned durations ==================
+    def _load_durations(self):
+        if not self.timings_path or not os.path.exists(self.timings_path):
+            return {}
+        try:
+            with open(self.timings_path) as f:
+                return {k: float(v) for k, v in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring servo timings file {self.timings_path}: {e}")
+            return {}
+
+    def _save_durations(self):
+        if not self.timings_path:
+            return
+        try:
+            with open(self.timings_path, 'w') as f:
+                json.dump(self.durations, f, indent=2, sort_keys=True)
+        except OSError as e:
+            print(f"⚠️ Could not save servo timings: {e}")
+
+    def _learn(self, letter, seconds):
+        prev = self.durations.get(letter)
+        self.durations[letter] = seconds if prev is None else prev + self.alpha * (seconds - prev)
+        self._save_durations()
+
+    def timeout_for(self, letter):
+        learned = self.durations.get(letter)
+        if learned is None:
+            return self.default_timeout
+        return max(self.min_timeout, learned * self.margin + 1.0)
+
+    # ============== Serial input ==================
+    def feed_line(self, line):
+        """Pass one line read from the ESP32. Returns True if it was a sequence status line."""
+        status = parse_status_line(line)
+        if status is None:
+            return False
+
+        kind, value = status
+        with self._cond:
+            if self._waiting_for is None:
+                return True
+            if kind == 'start' and value == self._waiting_for:
+                # Measure from when the firmware actually began moving
+                self._started_at = time.perf_counter()
+            elif kind == 'done' and value == self._waiting_for:
+                self._result = 'done'
+                self._cond.notify_all()
+            elif kind == 'release' and self._waiting_for == 'REL':
+                self._result = 'done'
+                self._cond.notify_all()
+            elif kind == 'unknown' and value == self._waiting_for:
+                self._result = 'unknown'
+                self._cond.notify_all()
+        return True
+
+    # ============== Playback ==================
+    def play(self, command, cancel=None):
+        """
+        Send command (a letter A–Z or 'REL') and block until the firmware
+        reports it finished, the timeout expires or cancel is set.
+        Returns False when cancelled or when the command could not be sent
+        (no ESP32 connected); there is nothing to wait for then.
+        """
+        command = command.upper()
+        timeout = self.timeout_for(command)
+        with self._cond:
+            self._waiting_for = command
+            self._result = None
+            self._started_at = None
+
+        sent_at = time.perf_counter()
+        if not self.send(command):
+            with self._cond:
+                self._waiting_for = None
+            return False
+
+        deadline = sent_at + timeout
+        try:
+            with self._cond:
+                while self._result is None:
+                    if cancel is not None and cancel.is_set():
+                        return False
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    # Short slices so a cancel is noticed quickly
+                    self._cond.wait(min(remaining, 0.1))
+                result = self._result
+                started_at = self._started_at or sent_at
+        finally:
+            with self._cond:
+                self._waiting_for = None
+
+        if result == 'done':
+            self._learn(command, time.perf_counter() - started_at)
+        elif result == 'unknown':
+            print(f"⚠️ ESP32 does not know command {command}")
+        else:
+            self.timeouts += 1
+            print(f"⚠️ No completion from ESP32 for {command} after {timeout:.1f}s, continuing")
+        return True
@@ -0,0 +1,135 @@
+"""
+Background, timed initialization of HandSignRecognizer's subsystems.
+
+Loading the hand model (TensorFlow import + .h5), the Vosk model, the TTS
+engine and the serial port used to run one after another in __init__
+before the first camera frame was shown. Startup registers each init
+function as a Subsystem instead:
+
+  - eager subsystems start right away on a small thread pool, so the camera
+    window opens while they load
+  - lazy subsystems (e.g. Vosk) only start the first time ensure() asks for
+    them
+  - each subsystem reports its state (pending / loading / ready / failed)
+    and how long its init took, and the time is logged when it finishes
+
+    startup = Startup()
+    startup.register('model', load_model)
+    startup.register('vosk', setup_vosk, lazy=True)
+    startup.start()
+    ...
+    if startup.is_ready('model'): ...
+    startup.ensure('vosk', cancel=cancel_event)   # blocks this thread only
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PENDING = 'pending'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class Subsystem:
+    def __init__(self, name, init, lazy=False):
+        self.name = name
+        self.init = init
+        self.lazy = lazy
+        self.state = PENDING
+        self.seconds = None
+        self.error = None
+        self.done = threading.Event()
+
+    def run(self):
+        self.state = LOADING
+        start = time.perf_counter()
+        try:
+            self.init()
+            self.state = READY
+        except Exception as e:
+            self.error = e
+            self.state = FAILED
+        finally:
+            self.seconds = time.perf_counter() - start
+            self.done.set()
+
+        if self.state == READY:
+            print(f"⏱️ {self.name} ready in {self.seconds:.2f}s")
+        else:
+            print(f"⚠️ {self.name} failed after {self.seconds:.2f}s: {self.error}")
+
+
+class Startup:
+    def __init__(self, max_workers=4):
+        self.subsystems = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="startup")
+        self._lock = threading.Lock()
+
+    def register(self, name, init, lazy=False):
+        self.subsystems[name] = Subsystem(name, init, lazy)
+
+    def start(self):
+        """Kick off every eager subsystem in the background."""
+        for subsystem in self.subsystems.values():
+            if not subsystem.lazy:
+                self._submit(subsystem)
+        return self
+
+    def run_now(self, name, init):
+        """Register name and initialize it on the calling thread (what the first frame needs)."""
+        subsystem = Subsystem(name, init)
+        self.subsystems[name] = subsystem
+        subsystem.state = LOADING
+        subsystem.run()
+        return subsystem.state == READY
+
+    def _submit(self, subsystem):
+        with self._lock:
+            if subsystem.state != PENDING:
+                return
+            subsystem.state = LOADING
+            self._executor.submit(subsystem.run)
+
+    # ============== Queries ==================
+    def is_ready(self, name):
+        return self.subsystems[name].state == READY
+
+    def ensure(self, name, timeout=None, cancel=None):
+        """
+        Start name if it has not started yet and wait until it finished.
+        Returns True when ready, False on failure, timeout or cancel.
+        """
+        subsystem = self.subsystems[name]
+        self._submit(subsystem)
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        # Short slices so a cancel is noticed quickly
+        while not subsystem.done.wait(0.1):
+            if cancel is not None and cancel.is_set():
+                return False
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+        return subsystem.state == READY
+
+    def wait_all(self, timeout=None):
+        """Wait for every subsystem that has been started (benchmark / tests)."""
+        for subsystem in self.subsystems.values():
+            if subsystem.state != PENDING:
+                subsystem.done.wait(timeout)
+
+    @property
+    def loading(self):
+        return any(s.state == LOADING for s in self.subsystems.values())
+
+    def status_text(self):
+        """'model loading | vosk on demand | tts ready' line for the video overlay."""
+        labels = {PENDING: 'on demand', LOADING: 'loading...', READY: 'ready', FAILED: 'failed'}
+        return " | ".join(f"{s.name} {labels[s.state]}" for s in self.subsystems.values())
+
+    def report(self):
+        """{name: (state, seconds)} for logging at exit."""
+        return {name: (s.state, None if s.seconds is None else round(s.seconds, 3))
+                for name, s in self.subsystems.items()}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
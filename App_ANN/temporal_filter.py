@@ -0,0 +1,149 @@
+"""
+Temporal stage between MediaPipe and the hand classifier.
+
+Each frame used to be classified on its own, so landmark jitter flipped the
+argmax between similar letters (M/N, U/V) and restarted the debounce run.
+Two pieces sit between MediaPipe and the classifier:
+
+  HandTracks       matches each detected hand to the nearest hand of the
+                   previous frame (by landmark centroid) and smooths its 21
+                   landmarks with a One-Euro filter. The filter smooths
+                   strongly while the hand is still and follows quickly
+                   when it moves.
+
+  PredictionCache  keeps the class probabilities per track together with the
+                   features they were computed from, and reuses them while
+                   the smoothed features stay within epsilon (max abs
+                   difference) of those features. A steady hand then needs
+                   no classifier call at all.
+
+Both are measured by `python benchmark.py --compare-smoothing`.
+"""
+import math
+
+import numpy as np
+
+
+class OneEuroFilter:
+    """One-Euro filter (Casiez et al. 2012) over a NumPy array of any shape."""
+
+    def __init__(self, min_cutoff=1.0, beta=10.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.x = None
+        self.dx = None
+        self.t = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, x, t):
+        x = np.asarray(x, dtype=np.float32)
+        if self.x is None or t <= self.t:
+            self.x, self.dx, self.t = x.copy(), np.zeros_like(x), t
+            return self.x
+
+        dt = t - self.t
+        self.t = t
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.dx += a_d * ((x - self.x) / dt - self.dx)
+
+        cutoff = self.min_cutoff + self.beta * np.abs(self.dx)
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        a = 1.0 / (1.0 + tau / dt)
+        self.x += a * (x - self.x)
+        return self.x
+
+
+class HandTracks:
+    def __init__(self, min_cutoff=1.0, beta=10.0, match_distance=0.15, max_age=0.5):
+        """
+        match_distance: max centroid distance (normalized) to continue a track
+        max_age:        seconds a track survives without a matching hand
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.match_distance = match_distance
+        self.max_age = max_age
+        self.tracks = {}  # id -> {'filter', 'centroid', 'seen'}
+        self._next_id = 0
+
+    def update(self, points, now):
+        """
+        points: (n, 21, 2) raw landmarks. Returns (smoothed (n, 21, 2), track ids).
+        """
+        centroids = points.mean(axis=1)
+        free = dict(self.tracks)
+        ids = []
+        smoothed = np.empty_like(points)
+
+        for i, centroid in enumerate(centroids):
+            best, best_dist = None, self.match_distance
+            for track_id, track in free.items():
+                dist = float(np.abs(track['centroid'] - centroid).max())
+                if dist < best_dist:
+                    best, best_dist = track_id, dist
+            if best is None:
+                best = self._next_id
+                self._next_id += 1
+                self.tracks[best] = {'filter': OneEuroFilter(self.min_cutoff, self.beta)}
+            else:
+                del free[best]
+
+            track = self.tracks[best]
+            smoothed[i] = track['filter'](points[i], now)
+            track['centroid'] = centroid
+            track['seen'] = now
+            ids.append(best)
+
+        for track_id, track in free.items():
+            if now - track['seen'] > self.max_age:
+                del self.tracks[track_id]
+        return smoothed, ids
+
+    def reset(self):
+        self.tracks = {}
+
+
+class PredictionCache:
+    def __init__(self, epsilon=0.004):
+        self.epsilon = epsilon
+        self.entries = {}  # track id -> (features, probs)
+        self.hits = 0
+        self.misses = 0
+
+    def predict(self, features, keys, predict):
+        """
+        Class probabilities for each feature row; rows close to their track's
+        cached features reuse the cached probabilities, the rest go through
+        predict(batch) in one call.
+        """
+        probs = [None] * len(features)
+        todo = []
+        for i, key in enumerate(keys):
+            entry = self.entries.get(key)
+            if entry is not None and np.abs(features[i] - entry[0]).max() < self.epsilon:
+                probs[i] = entry[1]
+                self.hits += 1
+            else:
+                todo.append(i)
+
+        if todo:
+            fresh = predict(features[todo])
+            for row, i in zip(fresh, todo):
+                probs[i] = row
+                self.entries[keys[i]] = (features[i].copy(), row)
+            self.misses += len(todo)
+
+        for key in list(self.entries):
+            if key not in keys:
+                del self.entries[key]
+        return np.stack(probs)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
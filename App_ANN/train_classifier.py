@@ -5,6 +5,19 @@ from sklearn.preprocessing import LabelEncoder
 import tensorflow as tf
 from tensorflow.keras import layers, models
 
+from feature_store import load_dataset
+from landmark_augment import LandmarkAugmenter, augmented_batches
+from train_pipeline import make_dataset
+
+# Augment the training rows on the fly (random mirror, rotation, scale and
+# jitter, see landmark_augment.py); the test split is never augmented
+AUGMENT = True
+BATCH_SIZE = 32
+
+# Stream batches from the memory-mapped feature store through tf.data
+# (train_pipeline.py) instead of fitting on in-memory NumPy arrays
+USE_TF_DATA = True
+
 def create_improved_model(input_shape=(42,), num_classes=26):
     model = models.Sequential([
         layers.Dense(256, activation='relu', input_shape=input_shape),
@@ -28,54 +41,73 @@ def create_improved_model(input_shape=(42,), num_classes=26):
     )
     return model
 
-# Load your collected data
-data_dict = pickle.load(open('./data.pickle', 'rb'))
-data = np.asarray(data_dict['data'])
-labels = np.asarray(data_dict['labels'])
-
-print(f"Dataset shape: {data.shape}")
-print(f"Labels: {np.unique(labels)}")
-print(f"Samples per class: {np.unique(labels, return_counts=True)[1]}")
-
-# Encode labels to integers
-label_encoder = LabelEncoder()
-labels_encoded = label_encoder.fit_transform(labels)
-
-# Split data
-x_train, x_test, y_train, y_test = train_test_split(
-    data, labels_encoded, test_size=0.2, shuffle=True, stratify=labels_encoded, random_state=42
-)
-
-print(f"Training samples: {len(x_train)}")
-print(f"Testing samples: {len(x_test)}")
-
-# Create and train model
-model = create_improved_model(input_shape=(data.shape[1],), 
-                             num_classes=len(np.unique(labels_encoded)))
-
-# Add callbacks for better training
-callbacks = [
-    tf.keras.callbacks.EarlyStopping(patience=15, restore_best_weights=True),
-    tf.keras.callbacks.ReduceLROnPlateau(factor=0.5, patience=10)
-]
-
-# Train the model
-history = model.fit(
-    x_train, y_train,
-    epochs=100,
-    batch_size=32,
-    validation_data=(x_test, y_test),
-    callbacks=callbacks,
-    verbose=1
-)
-
-# Evaluate final model
-test_loss, test_accuracy = model.evaluate(x_test, y_test, verbose=0)
-print(f'\nFinal Test Accuracy: {test_accuracy * 100:.2f}%')
-
-# Save the improved model and label encoder
-model.save('improved_hand_model.h5')
-with open('label_encoder.pickle', 'wb') as f:
-    pickle.dump({'label_encoder': label_encoder, 'classes': label_encoder.classes_}, f)
-
-print("Model and label encoder saved successfully!")
\ No newline at end of file
+if __name__ == "__main__":
+    # Load your collected data (./data_store, or the legacy ./data.pickle);
+    # a feature store stays memory-mapped when USE_TF_DATA is on
+    data, labels_encoded, manifest = load_dataset(mmap=USE_TF_DATA)
+    classes = np.asarray(manifest['classes'])
+
+    print(f"Dataset shape: {data.shape}")
+    print(f"Labels: {classes}")
+    print(f"Samples per class: {np.bincount(labels_encoded, minlength=len(classes))}")
+
+    # Labels are already integer indices into the sorted class table,
+    # exactly what LabelEncoder.fit_transform would have produced
+    label_encoder = LabelEncoder()
+    label_encoder.fit(classes)
+
+    # Split row indices, so the data itself is only read batch by batch
+    train_idx, test_idx = train_test_split(
+        np.arange(len(labels_encoded)), test_size=0.2, shuffle=True, stratify=labels_encoded, random_state=42
+    )
+
+    print(f"Training samples: {len(train_idx)}")
+    print(f"Testing samples: {len(test_idx)}")
+
+    # Create and train model
+    model = create_improved_model(input_shape=(data.shape[1],),
+                                  num_classes=len(classes))
+
+    # Add callbacks for better training
+    callbacks = [
+        tf.keras.callbacks.EarlyStopping(patience=15, restore_best_weights=True),
+        tf.keras.callbacks.ReduceLROnPlateau(factor=0.5, patience=10)
+    ]
+
+    # Training input; with AUGMENT every epoch sees a new variant of each training row
+    augmenter = LandmarkAugmenter(seed=42) if AUGMENT else None
+    if USE_TF_DATA:
+        train_input = {'x': make_dataset(data, labels_encoded, train_idx, BATCH_SIZE, augmenter=augmenter)}
+        validation_data = make_dataset(data, labels_encoded, test_idx, BATCH_SIZE, training=False, cache='')
+    else:
+        x_train, y_train = data[train_idx], labels_encoded[train_idx]
+        if AUGMENT:
+            train_input = {'x': augmented_batches(x_train, y_train, BATCH_SIZE, augmenter, seed=42),
+                           'steps_per_epoch': int(np.ceil(len(x_train) / BATCH_SIZE))}
+        else:
+            train_input = {'x': x_train, 'y': y_train, 'batch_size': BATCH_SIZE}
+        validation_data = (data[test_idx], labels_encoded[test_idx])
+
+    # Train the model
+    history = model.fit(
+        **train_input,
+        epochs=100,
+        validation_data=validation_data,
+        callbacks=callbacks,
+        verbose=1
+    )
+
+    # Evaluate final model
+    if USE_TF_DATA:
+        test_loss, test_accuracy = model.evaluate(validation_data, verbose=0)
+    else:
+        test_loss, test_accuracy = model.evaluate(*validation_data, verbose=0)
+    print(f'\nFinal Test Accuracy: {test_accuracy * 100:.2f}%')
+
+    # Save the improved model and label encoder
+    model.save('improved_hand_model.h5')
+    with open('label_encoder.pickle', 'wb') as f:
+        pickle.dump({'label_encoder': label_encoder, 'classes': label_encoder.classes_}, f)
+
+    print("Model and label encoder saved successfully!")
+    print("Run export_model.py to update hand_model.npz for TensorFlow-free inference.")
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+tf.data input pipeline for train_classifier.py.
+
+model.fit(x_train, y_train) needs the whole dataset as in-memory arrays and
+then does all batching on the training thread. make_dataset() instead streams
+from the memory-mapped feature store (feature_store.py):
+
+    index chunks --map(read, parallel)--> [cache] --> unbatch
+        --> shuffle(bounded buffer) --> batch --map(augment, parallel)--> prefetch
+
+  - rows are read from the memory map in chunks of READ_CHUNK indices, each
+    chunk sorted so it is read front to back; only the chunks in flight are
+    resident
+  - for training the indices are split into chunks at random, again every
+    epoch (once when cached): the store is sorted by class, so contiguous
+    chunks would hold one or two classes each and the bounded shuffle buffer
+    could not mix them into class-balanced batches
+  - the shuffle buffer holds at most SHUFFLE_BUFFER rows, however large the
+    store grows
+  - reading and landmark_augment.LandmarkAugmenter run in tf.data's parallel
+    map (tf.numpy_function; NumPy releases the GIL for the heavy parts)
+  - cache='' keeps the read rows in memory after the first epoch, a path
+    caches them on disk; the validation set is always cached
+  - prefetch overlaps input preparation with the training step
+
+Compare epoch time and peak memory against the in-memory arrays approach,
+each mode in a fresh process:
+
+    python train_pipeline.py --compare --epochs 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from feature_store import load_dataset
+
+BATCH_SIZE = 32
+SHUFFLE_BUFFER = 4096
+READ_CHUNK = 1024
+
+
+def make_dataset(features, labels, indices, batch_size=BATCH_SIZE, training=True,
+                 shuffle_buffer=SHUFFLE_BUFFER, augmenter=None, cache=None, read_chunk=READ_CHUNK):
+    """
+    tf.data.Dataset of (x, y) batches over features[indices] / labels[indices].
+
+    features / labels may be read-only memory maps. training=True shuffles
+    (random chunks plus a bounded row buffer); augmenter is applied per batch.
+    cache: None (read the store every epoch), '' (in memory) or a file prefix.
+    """
+    import tensorflow as tf
+
+    indices = np.sort(np.asarray(indices, dtype=np.int64))
+    feature_shape = tuple(features.shape[1:])
+
+    def read(index):
+        index = np.sort(index)
+        return np.asarray(features[index], dtype=np.float32), np.asarray(labels[index], dtype=np.int32)
+
+    def read_op(index):
+        x, y = tf.numpy_function(read, [index], (tf.float32, tf.int32))
+        x.set_shape((None,) + feature_shape)
+        y.set_shape((None,))
+        return x, y
+
+    ds = tf.data.Dataset.from_tensors(indices)
+    if training:
+        # New random split into chunks every epoch (the first one is kept when cached)
+        ds = ds.map(tf.random.shuffle)
+    ds = ds.flat_map(lambda index: tf.data.Dataset.from_tensor_slices(index).batch(read_chunk))
+    ds = ds.map(read_op, num_parallel_calls=tf.data.AUTOTUNE, deterministic=not training)
+    if cache is not None:
+        ds = ds.cache(cache)
+        if training:
+            # Chunk order after the cache, with the same row budget as the shuffle buffer
+            ds = ds.shuffle(max(1, shuffle_buffer // read_chunk), reshuffle_each_iteration=True)
+    ds = ds.unbatch()
+    if training:
+        ds = ds.shuffle(shuffle_buffer, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size)
+
+    if augmenter is not None:
+        def augment(x, seed):
+            # Own generator per call: the parallel map runs this on several threads
+            return augmenter(x, rng=np.random.default_rng(seed))
+
+        def augment_op(x, y):
+            seed = tf.random.uniform([], maxval=2 ** 31 - 1, dtype=tf.int64)
+            x = tf.numpy_function(augment, [x, seed], tf.float32)
+            x.set_shape((None,) + feature_shape)
+            return x, y
+
+        ds = ds.map(augment_op, num_parallel_calls=tf.data.AUTOTUNE)
+    return ds.prefetch(tf.data.AUTOTUNE)
+
+
+# ============== Measurement ==================
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None if it cannot be read."""
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 1024.0 if sys.platform != 'darwin' else rss / (1024.0 * 1024.0)
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / (1024.0 * 1024.0)
+        except (ImportError, AttributeError):
+            return None
+
+
+def run_mode(mode, epochs=3, batch_size=BATCH_SIZE, store=None):
+    """
+    Train create_improved_model for a few epochs with one input path:
+    'arrays' (everything loaded into NumPy arrays, the old approach) or
+    'tfdata' (make_dataset over the memory-mapped store). No augmentation,
+    so both do the same work. Returns timings and peak memory.
+    """
+    import tensorflow as tf
+    from sklearn.model_selection import train_test_split
+    from train_classifier import create_improved_model
+
+    start = time.perf_counter()
+    data, labels, manifest = load_dataset(store, mmap=(mode == 'tfdata'))
+    if mode == 'arrays':
+        data, labels = np.asarray(data, dtype=np.float32), np.asarray(labels)
+    train_idx, test_idx = train_test_split(
+        np.arange(len(labels)), test_size=0.2, shuffle=True, stratify=labels, random_state=42)
+
+    if mode == 'arrays':
+        inputs = {'x': data[train_idx], 'y': labels[train_idx], 'batch_size': batch_size}
+        validation = (data[test_idx], labels[test_idx])
+    else:
+        inputs = {'x': make_dataset(data, labels, train_idx, batch_size)}
+        validation = make_dataset(data, labels, test_idx, batch_size, training=False, cache='')
+    load_seconds = time.perf_counter() - start
+
+    epoch_times = []
+    epoch_start = []
+    timer = tf.keras.callbacks.LambdaCallback(
+        on_epoch_begin=lambda epoch, logs: epoch_start.append(time.perf_counter()),
+        on_epoch_end=lambda epoch, logs: epoch_times.append(time.perf_counter() - epoch_start[-1]))
+
+    model = create_improved_model(input_shape=(data.shape[1],), num_classes=len(manifest['classes']))
+    model.fit(**inputs, epochs=epochs, validation_data=validation, callbacks=[timer], verbose=0)
+
+    return {
+        'mode': mode,
+        'samples': int(len(labels)),
+        'batch_size': batch_size,
+        'load_seconds': load_seconds,
+        # The first epoch includes tracing and cache filling
+        'first_epoch_seconds': epoch_times[0],
+        'epoch_seconds': float(np.mean(epoch_times[1:] or epoch_times)),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def compare(epochs, batch_size, store=None):
+    """run_mode() for both input paths, each in a fresh process so peak memory is per mode."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    for mode in ('arrays', 'tfdata'):
+        cmd = [sys.executable, os.path.abspath(__file__), '--mode', mode,
+               '--epochs', str(epochs), '--batch-size', str(batch_size)]
+        if store:
+            cmd += ['--store', store]
+        out = subprocess.run(cmd, cwd=here, capture_output=True, text=True)
+        if out.returncode != 0:
+            print(f"⚠️ {mode} failed:\n{out.stderr.strip()}")
+            continue
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.0f} MB" if r['peak_rss_mb'] is not None else "n/a"
+        print(f"{r['mode']:>7}: {r['samples']} samples, batch {r['batch_size']} | load {r['load_seconds']:.2f}s "
+              f"| epoch {r['epoch_seconds']:.2f}s (first {r['first_epoch_seconds']:.2f}s) | peak RSS {rss}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the tf.data input pipeline with in-memory arrays")
+    parser.add_argument('--mode', choices=('arrays', 'tfdata'), help="Run one mode and print its result as JSON")
+    parser.add_argument('--compare', action='store_true', help="Run both modes in separate processes")
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--store', default=None, help="Feature store (default: ./data_store or ./data.pickle)")
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.epochs, args.batch_size, args.store)))
+    else:
+        compare(args.epochs, args.batch_size, args.store)
+
+
+if __name__ == "__main__":
+    main()
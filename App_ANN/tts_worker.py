@@ -0,0 +1,217 @@
+"""
+Background text-to-speech for HandSignRecognizer.
+
+speak requests are queued and played by a worker thread, so the video loop
+never waits on audio. The queue is bounded: when it is full the oldest
+pending utterance is dropped, utterances that waited longer than max_age
+are skipped as stale, and a repeat of an already pending word is coalesced.
+Single letters are never coalesced: the second L of HELLO is a real letter.
+
+Engines share a tiny interface (warmup() / say(text)):
+
+    WinSpeechEngine   winspeech (Windows SAPI), what the kiosks use
+    Pyttsx3Engine     pyttsx3, cross-platform
+    NullEngine        no audio; records utterances and optionally appends
+                      them to a text file (Linux tests / benchmark)
+"""
+import threading
+import time
+from collections import deque
+
+
+# ============== Engines ==================
+class SpeechEngine:
+    name = 'base'
+
+    def warmup(self):
+        pass
+
+    def say(self, text):
+        raise NotImplementedError
+
+
+class WinSpeechEngine(SpeechEngine):
+    name = 'winspeech'
+
+    def __init__(self):
+        import winspeech
+        self._winspeech = winspeech
+
+    def warmup(self):
+        # First call initializes SAPI; done here so it never lands on a live letter
+        self._winspeech.say("Test")
+
+    def say(self, text):
+        self._winspeech.say(text)
+
+
+class Pyttsx3Engine(SpeechEngine):
+    name = 'pyttsx3'
+
+    def __init__(self):
+        import pyttsx3
+        self._pyttsx3 = pyttsx3
+        self._engine = None
+
+    def warmup(self):
+        # pyttsx3 engines must be created on the thread that uses them
+        self._engine = self._pyttsx3.init()
+
+    def say(self, text):
+        if self._engine is None:
+            self.warmup()
+        self._engine.say(text)
+        self._engine.runAndWait()
+
+
+class NullEngine(SpeechEngine):
+    """Silent stand-in: keeps every utterance and can append them to a file."""
+
+    name = 'null'
+
+    def __init__(self, path=None, duration=0.0):
+        self.path = path
+        self.duration = duration  # simulated speaking time per utterance
+        self.spoken = []
+
+    def say(self, text):
+        self.spoken.append(text)
+        if self.path:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(text + '\n')
+        if self.duration:
+            time.sleep(self.duration)
+
+
+ENGINES = {
+    'winspeech': WinSpeechEngine,
+    'pyttsx3': Pyttsx3Engine,
+    'null': NullEngine,
+}
+
+
+def create_engine(name='auto'):
+    """Build a speech engine by name; 'auto' tries winspeech, then pyttsx3, then null."""
+    if name != 'auto':
+        return ENGINES[name]()
+    for candidate in ('winspeech', 'pyttsx3'):
+        try:
+            return ENGINES[candidate]()
+        except ImportError:
+            continue
+    print("⚠️ No TTS engine available, speech is disabled.")
+    return NullEngine()
+
+
+# ============== Worker ==================
+class SpeechWorker:
+    def __init__(self, engine, max_queue=3, max_age=3.0, perf=None):
+        """
+        max_queue: pending utterances kept; the oldest is dropped beyond that
+        max_age:   seconds an utterance may wait before it is skipped as stale
+        perf:      optional PerfStats receiving 'tts_wait' / 'tts_speak' timings
+        """
+        self.engine = engine
+        self.max_queue = max_queue
+        self.max_age = max_age
+        self.perf = perf
+
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+        self.is_speaking = False
+        self.spoken_count = 0
+        self.dropped_count = 0
+        self.coalesced_count = 0
+        self.last_latency = 0.0
+
+    # ============== Lifecycle ==================
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="tts", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        with self._cond:
+            self._running = False
+            self._pending.clear()
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # ============== Requests ==================
+    def say(self, text, replace=False):
+        """
+        Queue text for speaking and return immediately.
+        replace=True discards anything still pending (e.g. speaking the whole
+        word supersedes letters that have not been spoken yet). A word that is
+        already pending is not queued twice; letters always are.
+        """
+        if not text:
+            return
+        with self._cond:
+            if replace:
+                self.dropped_count += len(self._pending)
+                self._pending.clear()
+            elif len(text) > 1 and any(pending == text for pending, _ in self._pending):
+                self.coalesced_count += 1
+                return
+            if len(self._pending) >= self.max_queue:
+                self._pending.popleft()
+                self.dropped_count += 1
+            self._pending.append((text, time.perf_counter()))
+            self._cond.notify()
+
+    @property
+    def queue_depth(self):
+        return len(self._pending)
+
+    def metrics(self):
+        return {
+            'engine': self.engine.name,
+            'queue_depth': self.queue_depth,
+            'speaking': self.is_speaking,
+            'spoken': self.spoken_count,
+            'dropped': self.dropped_count,
+            'coalesced': self.coalesced_count,
+            'last_latency_ms': self.last_latency * 1000.0,
+        }
+
+    # ============== Thread ==================
+    def _run(self):
+        try:
+            self.engine.warmup()
+        except Exception as e:
+            print("TTS warmup error:", e)
+
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or not self._running)
+                if not self._running:
+                    return
+                text, queued_at = self._pending.popleft()
+
+            waited = time.perf_counter() - queued_at
+            if waited > self.max_age:
+                self.dropped_count += 1
+                continue
+
+            self.last_latency = waited
+            if self.perf is not None:
+                self.perf.add('tts_wait', waited)
+
+            self.is_speaking = True
+            start = time.perf_counter()
+            try:
+                self.engine.say(text)
+                self.spoken_count += 1
+            except Exception as e:
+                print("TTS error:", e)
+            finally:
+                self.is_speaking = False
+                if self.perf is not None:
+                    self.perf.add('tts_speak', time.perf_counter() - start)
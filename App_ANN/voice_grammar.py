@@ -0,0 +1,114 @@
+"""
+Grammar-constrained Vosk decoding for the Voice+Servo word.
+
+The servo can only play A–Z and at most MAX_VOICE_LETTERS of them, so the
+recognizer does not need the full small-en-us vocabulary. In grammar mode
+KaldiRecognizer gets a phrase list of
+
+  - the allowed words (DEFAULT_WORDS or one word per line in voice_words.txt)
+  - the spoken letter names ("ay", "bee", "see", ..., "double you")
+  - "[unk]", so anything else decodes to an ignorable token instead of being
+    forced onto the closest allowed word
+
+which decodes faster and much more reliably than free dictation.
+
+text_to_word() turns the recognized text into the letters to play: a single
+allowed word is played as is, letter names become their letter
+("bee ay dee" -> BAD), "[unk]" is dropped and any other token falls back to
+its own letters. With letter_names=False (unconstrained decoding) it keeps
+the old behaviour, the letters of the text only, so free dictation such as
+"are you ok" is not read as letter names.
+"""
+import json
+import os
+
+VOICE_WORDS_PATH = 'voice_words.txt'
+
+UNKNOWN_TOKEN = '[unk]'
+
+DEFAULT_WORDS = [
+    'hello', 'hi', 'yes', 'no', 'ok', 'help', 'stop', 'go',
+    'love', 'thanks', 'please', 'good', 'bad', 'water', 'food',
+]
+
+# Spoken forms Vosk produces for each letter
+LETTER_NAMES = {
+    'A': ['a', 'ay'],
+    'B': ['b', 'bee', 'be'],
+    'C': ['c', 'see', 'sea'],
+    'D': ['d', 'dee'],
+    'E': ['e'],
+    'F': ['f', 'ef'],
+    'G': ['g', 'gee'],
+    'H': ['h', 'aitch'],
+    'I': ['i', 'eye'],
+    'J': ['j', 'jay'],
+    'K': ['k', 'kay'],
+    'L': ['l', 'el'],
+    'M': ['m', 'em'],
+    'N': ['n', 'en'],
+    'O': ['o', 'oh'],
+    'P': ['p', 'pee'],
+    'Q': ['q', 'cue', 'queue'],
+    'R': ['r', 'are'],
+    'S': ['s', 'es'],
+    'T': ['t', 'tea', 'tee'],
+    'U': ['u', 'you'],
+    'V': ['v', 'vee'],
+    'W': ['w', 'double you'],
+    'X': ['x', 'ex'],
+    'Y': ['y', 'why'],
+    'Z': ['z', 'zed', 'zee'],
+}
+
+# spoken form -> letter; multi-word forms ("double you") are matched first
+SPOKEN_TO_LETTER = {name: letter for letter, names in LETTER_NAMES.items() for name in names}
+MAX_NAME_TOKENS = max(len(name.split()) for name in SPOKEN_TO_LETTER)
+
+
+def load_words(path=VOICE_WORDS_PATH, max_letters=None):
+    """Allowed words from path (one per line, '#' comments) or DEFAULT_WORDS."""
+    words = DEFAULT_WORDS
+    if path and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            words = [line.split('#', 1)[0].strip().lower() for line in f]
+    words = [w for w in words if w and w.isalpha()]
+    if max_letters:
+        words = [w for w in words if len(w) <= max_letters]
+    return sorted(set(words))
+
+
+def build_grammar(words):
+    """JSON phrase list for KaldiRecognizer(model, rate, grammar)."""
+    phrases = set(words) | set(SPOKEN_TO_LETTER)
+    return json.dumps(sorted(phrases) + [UNKNOWN_TOKEN])
+
+
+def text_to_word(text, words=(), max_letters=None, letter_names=True):
+    """
+    Map recognized text to an uppercase A–Z word (possibly empty).
+    letter_names: map spoken letter names (grammar mode only)
+    """
+    tokens = [t for t in text.lower().split() if t != UNKNOWN_TOKEN]
+    if not letter_names:
+        letters = ''.join(ch.upper() for token in tokens for ch in token if ch.isalpha())
+    elif len(tokens) == 1 and tokens[0] in words:
+        letters = tokens[0].upper()
+    else:
+        letters = []
+        i = 0
+        while i < len(tokens):
+            for size in range(min(MAX_NAME_TOKENS, len(tokens) - i), 0, -1):
+                letter = SPOKEN_TO_LETTER.get(' '.join(tokens[i:i + size]))
+                if letter:
+                    letters.append(letter)
+                    i += size
+                    break
+            else:
+                letters.extend(ch.upper() for ch in tokens[i] if ch.isalpha())
+                i += 1
+        letters = ''.join(letters)
+
+    if max_letters:
+        letters = letters[:max_letters]
+    return letters
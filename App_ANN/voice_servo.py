@@ -0,0 +1,110 @@
+"""
+Voice -> servo sequence as a cancellable background job.
+
+BTN2 used to listen for a word and then play it letter by letter on the
+ESP32 with an 8 s sleep per letter, blocking the whole app (camera, buttons,
+even BTN1 = quit) for up to a minute. VoiceServoJob runs the same steps on
+its own thread and publishes its progress as a small state machine:
+
+    LISTENING -> PLAYING (letter i of word) -> DONE
+        any state -> CANCELLED (cancel()) or FAILED (no word / no serial)
+
+The main loop keeps rendering the overlay from snapshot() and keeps
+handling buttons, so BTN1 or a new BTN2 can abort a job immediately.
+"""
+import threading
+
+IDLE = 'idle'
+LISTENING = 'listening'
+PLAYING = 'playing'
+DONE = 'done'
+CANCELLED = 'cancelled'
+FAILED = 'failed'
+
+ACTIVE_STATES = (LISTENING, PLAYING)
+
+
+class VoiceServoJob:
+    def __init__(self, listen, play_letter, on_word=None, on_cancel=None):
+        """
+        listen:      callable(cancel_event) -> word or None
+        play_letter: callable(letter, cancel_event) -> True when the letter
+                     finished, False if it was interrupted by cancel_event or
+                     could not be sent (the job then ends FAILED)
+        on_word:     optional callable(word) once a word was recognized
+        on_cancel:   optional callable() after an aborted playback (e.g. send REL)
+        """
+        self.listen = listen
+        self.play_letter = play_letter
+        self.on_word = on_word
+        self.on_cancel = on_cancel
+
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self.state = IDLE
+        self.word = ""
+        self.index = -1
+        self.message = ""
+
+    # ============== Control ==================
+    def start(self):
+        self._set(LISTENING, message="Listening...")
+        self._thread = threading.Thread(target=self._run, name="voice-servo", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self, wait=False, timeout=2.0):
+        """Abort listening / playback as soon as the current step notices."""
+        self.cancel_event.set()
+        if wait and self._thread:
+            self._thread.join(timeout)
+
+    @property
+    def active(self):
+        return self.state in ACTIVE_STATES
+
+    def snapshot(self):
+        """(state, word, current letter index, message), consistent for rendering."""
+        with self._lock:
+            return self.state, self.word, self.index, self.message
+
+    # ============== Thread ==================
+    def _set(self, state, **fields):
+        with self._lock:
+            self.state = state
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+    def _run(self):
+        try:
+            word = self.listen(self.cancel_event)
+            if self.cancel_event.is_set():
+                self._set(CANCELLED, message="Cancelled")
+                return
+            if not word:
+                self._set(FAILED, message="No valid word from voice")
+                return
+
+            if self.on_word:
+                self.on_word(word)
+
+            for i, ch in enumerate(word):
+                if not ch.isalpha():
+                    continue
+                self._set(PLAYING, word=word, index=i, message=f"Letter: {ch}")
+                played = self.play_letter(ch, self.cancel_event)
+                if not played and not self.cancel_event.is_set():
+                    self._set(FAILED, message="No serial connected")
+                    return
+                if not played or self.cancel_event.is_set():
+                    self._set(CANCELLED, message="Cancelled")
+                    if self.on_cancel:
+                        self.on_cancel()
+                    return
+
+            self._set(DONE, message="Done")
+        except Exception as e:
+            print("Voice+Servo job error:", e)
+            self._set(FAILED, message=str(e))
@@ -0,0 +1,254 @@
+"""
+Always-on audio capture feeding a streaming Vosk recognizer.
+
+listen_for_voice_word() used to open a new sd.RawInputStream on every BTN2
+press and then wait for a final Result() or the full 4 s timeout. Opening
+the stream costs time and clips the first syllables.
+
+Here the input stream stays open for the whole session. While nobody is
+listening, the most recent audio is kept in a short pre-roll ring buffer and
+the recognizer is idle. listen():
+
+  1. resets the recognizer and feeds it the pre-roll first, so speech that
+     started just before the button press is not lost
+  2. feeds live blocks as they arrive
+  3. ends as soon as the recognizer returns a final Result(), or when the
+     PartialResult() text has not changed for endpoint_ms (the speaker
+     stopped), or on the timeout / cancel
+
+Audio sources share a start(callback) / stop() interface:
+
+    MicrophoneSource  sounddevice input stream (the live app)
+    WavSource         16-bit mono WAV file played in (or faster than) real time
+
+Try it without a microphone:
+
+    python voice_stream.py --wav hello.wav --model vosk-model-small-en-us-0.15
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+import wave
+from collections import deque
+
+
+# ============== Audio sources ==================
+class MicrophoneSource:
+    def __init__(self, sample_rate=16000, block_size=480):
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self._stream = None
+
+    def start(self, callback):
+        import sounddevice as sd
+
+        def audio_callback(indata, frames, time_info, status):
+            callback(bytes(indata))
+
+        self._stream = sd.RawInputStream(samplerate=self.sample_rate,
+                                         blocksize=self.block_size,
+                                         dtype='int16',
+                                         channels=1,
+                                         callback=audio_callback)
+        self._stream.start()
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+
+class WavSource:
+    """Plays a 16-bit mono WAV file into the listener, followed by silence."""
+
+    def __init__(self, path, block_ms=30, speed=1.0, tail_silence=2.0):
+        """
+        speed:        1.0 = real time, 0 = as fast as possible
+        tail_silence: seconds of silence appended so endpointing can trigger
+        """
+        self.path = path
+        self.block_ms = block_ms
+        self.speed = speed
+        self.tail_silence = tail_silence
+        self._stop = threading.Event()
+        self._thread = None
+        self.finished = threading.Event()
+
+        with wave.open(path, 'rb') as wf:
+            if wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+                raise ValueError(f"{path}: expected 16-bit mono WAV")
+            self.sample_rate = wf.getframerate()
+            self.pcm = wf.readframes(wf.getnframes())
+
+    def start(self, callback):
+        self._stop.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._run, args=(callback,), name="wav-source", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, callback):
+        block_bytes = int(self.sample_rate * self.block_ms / 1000) * 2
+        pcm = self.pcm + bytes(int(self.sample_rate * self.tail_silence) * 2)
+        delay = self.block_ms / 1000.0 / self.speed if self.speed else 0.0
+        next_time = time.perf_counter()
+        for offset in range(0, len(pcm), block_bytes):
+            if self._stop.is_set():
+                break
+            callback(pcm[offset:offset + block_bytes])
+            if delay:
+                next_time += delay
+                self._stop.wait(max(0.0, next_time - time.perf_counter()))
+        self.finished.set()
+
+
+# ============== Listener ==================
+class StreamingListener:
+    def __init__(self, recognizer, source, block_ms=30, preroll_ms=500, endpoint_ms=700):
+        """
+        recognizer:  KaldiRecognizer (or anything with Reset / AcceptWaveform /
+                     Result / PartialResult / FinalResult)
+        preroll_ms:  audio before listen() that is decoded too
+        endpoint_ms: stop once the partial text is unchanged this long
+        """
+        self.recognizer = recognizer
+        self.source = source
+        self.endpoint_sec = endpoint_ms / 1000.0
+
+        self._lock = threading.Lock()
+        # One listen() at a time: they share the recognizer
+        self._listen_lock = threading.Lock()
+        self._preroll = deque(maxlen=max(1, preroll_ms // block_ms))
+        self._live = queue.Queue()
+        self._active = False
+
+        # Details about the last listen(), for logs and the benchmark
+        self.last_endpoint = None   # 'final', 'stable', 'timeout', 'cancelled'
+        self.last_latency = 0.0     # listen() call -> text available (s)
+
+    def start(self):
+        self.source.start(self._on_audio)
+        return self
+
+    def stop(self):
+        self.source.stop()
+
+    def _on_audio(self, block):
+        # Runs on the audio thread: only hand the block over, never decode here
+        with self._lock:
+            if self._active:
+                self._live.put(block)
+            else:
+                self._preroll.append(block)
+
+    def _begin(self):
+        """Start routing audio to a fresh queue. Returns (pre-roll blocks, live queue)."""
+        with self._lock:
+            blocks = list(self._preroll)
+            self._preroll.clear()
+            self._live = queue.Queue()
+            self._active = True
+            return blocks, self._live
+
+    def _end(self, live):
+        with self._lock:
+            # Only the listen() that owns the current queue may stop it
+            if self._live is live:
+                self._active = False
+
+    def listen(self, timeout=4.0, cancel=None):
+        """
+        Return the recognized text ('' if nothing was said) or None if cancelled.
+        Calls from several threads are serialized; a cancelled call returns
+        within about 100 ms, so the next one starts right after.
+        """
+        with self._listen_lock:
+            return self._listen(timeout, cancel)
+
+    def _listen(self, timeout, cancel):
+        start = time.perf_counter()
+        self.recognizer.Reset()
+        blocks, live = self._begin()
+        pending = deque(blocks)
+        partial = ""
+        partial_since = start
+        self.last_endpoint = 'timeout'
+        text = None
+
+        try:
+            deadline = start + timeout
+            while True:
+                if cancel is not None and cancel.is_set():
+                    self.last_endpoint = 'cancelled'
+                    return None
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+
+                if pending:
+                    data = pending.popleft()
+                else:
+                    try:
+                        # Short waits so a cancel is noticed quickly
+                        data = live.get(timeout=min(deadline - now, 0.1))
+                    except queue.Empty:
+                        if partial and time.perf_counter() - partial_since >= self.endpoint_sec:
+                            self.last_endpoint = 'stable'
+                            break
+                        continue
+
+                if self.recognizer.AcceptWaveform(data):
+                    result = json.loads(self.recognizer.Result()).get("text", "").strip()
+                    if result:
+                        text = result
+                        self.last_endpoint = 'final'
+                        break
+                    continue
+
+                current = json.loads(self.recognizer.PartialResult()).get("partial", "").strip()
+                now = time.perf_counter()
+                if current != partial:
+                    partial, partial_since = current, now
+                elif partial and not pending and now - partial_since >= self.endpoint_sec:
+                    self.last_endpoint = 'stable'
+                    break
+
+            if text is None:
+                text = json.loads(self.recognizer.FinalResult()).get("text", "").strip() or partial
+            return text
+        finally:
+            self._end(live)
+            self.last_latency = time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the streaming Vosk listener on a WAV file")
+    parser.add_argument('--wav', required=True, help="16-bit mono WAV (16 kHz like the app)")
+    parser.add_argument('--model', required=True, help="Vosk model directory")
+    parser.add_argument('--press-at', type=float, default=0.0, help="Seconds into the file when 'BTN2' is pressed")
+    parser.add_argument('--timeout', type=float, default=4.0)
+    parser.add_argument('--speed', type=float, default=1.0, help="Playback speed, 0 = as fast as possible")
+    args = parser.parse_args()
+
+    from vosk import Model, KaldiRecognizer
+
+    source = WavSource(args.wav, speed=args.speed)
+    recognizer = KaldiRecognizer(Model(args.model), source.sample_rate)
+    listener = StreamingListener(recognizer, source).start()
+    time.sleep(args.press_at / (args.speed or 1.0))
+    text = listener.listen(timeout=args.timeout)
+    listener.stop()
+    print(f"Text: '{text}'  endpoint: {listener.last_endpoint}  "
+          f"latency: {listener.last_latency * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()